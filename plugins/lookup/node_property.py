@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2025, Rudder <dev@rudder.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+DOCUMENTATION = r"""
+name: node_property
+author: Rudder (@Normation)
+version_added: '1.1.0'
+short_description: Read Rudder node properties
+description:
+  - Read the value of node properties from a Rudder server.
+  - All nodes are fetched with a single API call on first use, and the result is memoized
+    in the current process, so reading several properties or nodes for one host costs one request.
+  - Ansible templates each host in a separate forked worker, so without O(cache_ttl) every host
+    fetches the nodes again. Set O(cache_ttl) to share the result between the workers through an
+    on-disk cache, then reading a property for many hosts costs one request.
+options:
+  _terms:
+    description: Names of the properties to read.
+    required: true
+    type: list
+    elements: str
+  node_id:
+    description: Identifier of the node. Either O(node_id) or O(hostname) is required.
+    type: str
+  hostname:
+    description: Hostname of the node, used when O(node_id) is not set.
+    type: str
+  default:
+    description: Value returned for properties not defined on the node.
+    type: raw
+  rudder_url:
+    description: Rudder server URL.
+    type: str
+    default: https://localhost/rudder
+    env:
+      - name: RUDDER_URL
+  rudder_token:
+    description: Rudder server token. Defaults to the content of /var/rudder/run/api-token if not set.
+    type: str
+    env:
+      - name: RUDDER_TOKEN
+  validate_certs:
+    description: Choosing either to ignore or not Rudder certificate validation.
+    type: bool
+    default: true
+  cache_ttl:
+    description:
+      - Number of seconds the nodes list is kept on disk and shared between processes.
+      - C(0) disables the on-disk cache, the result is then only memoized in the current worker process.
+    type: int
+    default: 0
+  cache_dir:
+    description:
+      - Directory of the on-disk cache. Defaults to C(~/.ansible/tmp/rudder_api_cache).
+      - It must belong to the current user and must not be writable by other users, as the cached answers can be sensitive.
+    type: path
+"""
+
+EXAMPLES = r"""
+- name: Read the environment of the current host from its Rudder node properties
+  ansible.builtin.debug:
+    msg: "{{ lookup('rudder.rudder.node_property', 'env_type', hostname=inventory_hostname, cache_ttl=300) }}"
+
+- name: Read several properties of a node
+  ansible.builtin.set_fact:
+    rudder_props: "{{ query('rudder.rudder.node_property', 'env_type', 'datacenter', node_id='root', default='') }}"
+"""
+
+RETURN = r"""
+_raw:
+  description: Values of the requested properties, in the order of the terms.
+  type: list
+  elements: raw
+"""
+
+from ansible.errors import AnsibleLookupError
+from ansible.plugins.lookup import LookupBase
+
+from ..module_utils.rudder_client import RudderApiClient
+from ..plugin_utils.rudder_api import (
+    ApiCache,
+    ApiCacheError,
+    ModuleShim,
+    RudderModuleError,
+)
+
+__metaclass__ = type
+
+
+def fetch_node_properties(client):
+    """Fetch the properties of all nodes in one call
+
+    Returns:
+        dict: 'by_id' and 'by_hostname' mappings to {property name: value}.
+    """
+    nodes = client.get('/api/latest/nodes?include=minimal,properties')['data']['nodes']
+    by_id = {}
+    by_hostname = {}
+    for node in nodes:
+        properties = dict((p['name'], p['value']) for p in node.get('properties', []))
+        by_id[node['id']] = properties
+        if node.get('hostname'):
+            by_hostname[node['hostname']] = properties
+    return {'by_id': by_id, 'by_hostname': by_hostname}
+
+
+class LookupModule(LookupBase):
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+        node_id = self.get_option('node_id')
+        hostname = self.get_option('hostname')
+        if node_id is None and hostname is None:
+            raise AnsibleLookupError('Either node_id or hostname is required')
+
+        rudder_url = self.get_option('rudder_url')
+        rudder_token = self.get_option('rudder_token')
+        cache = ApiCache(self.get_option('cache_ttl'), self.get_option('cache_dir'))
+        try:
+            client = RudderApiClient(ModuleShim({
+                'rudder_url': rudder_url,
+                'rudder_token': rudder_token,
+                'validate_certs': self.get_option('validate_certs'),
+            }))
+            nodes = cache.get(
+                ApiCache.key('node_property', rudder_url, rudder_token or ''),
+                lambda: fetch_node_properties(client),
+            )
+        except RudderModuleError as e:
+            raise AnsibleLookupError('Could not read node properties: {err} {reason}'.format(
+                err=e, reason=e.result.get('reason') or ''))
+        except ApiCacheError as e:
+            raise AnsibleLookupError('Could not read node properties: {err}'.format(err=e))
+
+        if node_id is not None:
+            properties = nodes['by_id'].get(node_id)
+        else:
+            properties = nodes['by_hostname'].get(hostname)
+        if properties is None:
+            raise AnsibleLookupError('Node {node} not found on {url}'.format(
+                node=node_id if node_id is not None else hostname, url=rudder_url))
+
+        ret = []
+        for term in terms:
+            if term in properties:
+                ret.append(properties[term])
+            elif self.get_option('default') is not None:
+                ret.append(self.get_option('default'))
+            else:
+                raise AnsibleLookupError('Property {name} is not defined on the node'.format(name=term))
+        return ret
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2025, Rudder <dev@rudder.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+DOCUMENTATION = r"""
+name: setting
+author: Rudder (@Normation)
+version_added: '1.1.0'
+short_description: Read Rudder server settings
+description:
+  - Read the value of Rudder server settings, with the same names as the P(rudder.rudder.server_settings#module) module.
+  - All settings are fetched with a single API call on first use, and the result is memoized
+    in the current process. Settings not part of the global list, like C(allowed_networks/<relay id>),
+    are read one by one and memoized the same way.
+  - Ansible templates each host in a separate forked worker, so without O(cache_ttl) every host
+    fetches the settings again. Set O(cache_ttl) to share the result between the workers through an
+    on-disk cache.
+options:
+  _terms:
+    description: Names of the settings to read.
+    required: true
+    type: list
+    elements: str
+  rudder_url:
+    description: Rudder server URL.
+    type: str
+    default: https://localhost/rudder
+    env:
+      - name: RUDDER_URL
+  rudder_token:
+    description: Rudder server token. Defaults to the content of /var/rudder/run/api-token if not set.
+    type: str
+    env:
+      - name: RUDDER_TOKEN
+  validate_certs:
+    description: Choosing either to ignore or not Rudder certificate validation.
+    type: bool
+    default: true
+  cache_ttl:
+    description:
+      - Number of seconds the settings are kept on disk and shared between processes.
+      - C(0) disables the on-disk cache, the result is then only memoized in the current worker process.
+    type: int
+    default: 0
+  cache_dir:
+    description:
+      - Directory of the on-disk cache. Defaults to C(~/.ansible/tmp/rudder_api_cache).
+      - It must belong to the current user and must not be writable by other users, as the cached answers can be sensitive.
+    type: path
+"""
+
+EXAMPLES = r"""
+- name: Read the modified files retention of the server
+  ansible.builtin.debug:
+    msg: "{{ lookup('rudder.rudder.setting', 'modified_file_ttl', rudder_url='https://my.rudder.server/rudder') }}"
+
+- name: Read the allowed networks of the root server
+  ansible.builtin.debug:
+    msg: "{{ lookup('rudder.rudder.setting', 'allowed_networks/root', cache_ttl=300) }}"
+"""
+
+RETURN = r"""
+_raw:
+  description: Values of the requested settings, in the order of the terms.
+  type: list
+  elements: raw
+"""
+
+from ansible.errors import AnsibleLookupError
+from ansible.plugins.lookup import LookupBase
+
+from ..module_utils.rudder_client import RudderApiClient
+from ..plugin_utils.rudder_api import (
+    ApiCache,
+    ApiCacheError,
+    ModuleShim,
+    RudderModuleError,
+)
+
+__metaclass__ = type
+
+
+def fetch_setting(client, name):
+    """Fetch one setting, for the settings not part of the global list"""
+    data = client.get('/api/latest/settings/{name}'.format(name=name))['data']
+    if 'allowed_networks' in name:
+        return data['allowed_networks']
+    return data['settings'][name]
+
+
+class LookupModule(LookupBase):
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+        rudder_url = self.get_option('rudder_url')
+        rudder_token = self.get_option('rudder_token')
+        cache = ApiCache(self.get_option('cache_ttl'), self.get_option('cache_dir'))
+
+        ret = []
+        try:
+            client = RudderApiClient(ModuleShim({
+                'rudder_url': rudder_url,
+                'rudder_token': rudder_token,
+                'validate_certs': self.get_option('validate_certs'),
+            }))
+            settings = cache.get(
+                ApiCache.key('setting', rudder_url, rudder_token or ''),
+                lambda: client.get('/api/latest/settings')['data']['settings'],
+            )
+            for term in terms:
+                if term in settings:
+                    ret.append(settings[term])
+                else:
+                    ret.append(cache.get(
+                        ApiCache.key('setting', rudder_url, rudder_token or '', term),
+                        lambda: fetch_setting(client, term),
+                    ))
+        except RudderModuleError as e:
+            raise AnsibleLookupError('Could not read Rudder settings: {err} {reason}'.format(
+                err=e, reason=e.result.get('reason') or ''))
+        except ApiCacheError as e:
+            raise AnsibleLookupError('Could not read Rudder settings: {err}'.format(err=e))
+        return ret
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2025, Rudder <dev@rudder.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Rudder API client and helpers shared by the modules"""
+
+from __future__ import absolute_import, division, print_function
+
+import base64
+import hashlib
+import json
+
+from ansible.module_utils.urls import open_url
+
+__metaclass__ = type
+
+DEFAULT_RUDDER_URL = 'https://localhost/rudder'
+SYSTEM_TOKEN_FILE = '/var/rudder/run/api-token'
+
+
+class RudderApiError(Exception):
+    """Raised instead of exiting the module, when the caller reports the errors itself"""
+
+
+def json_query_to_url_query(json_query):
+    """
+    Expects an array of the form:
+      [
+          {
+              "object_type": "node",
+              "attribute": "OS",
+              "comparator": "eq",
+              "value": "Linux"
+          },
+          {
+              "object_type": "node",
+              "attribute": "osFullName",
+              "comparator": "regex",
+              "value": ".*Linux.*"
+          },
+          {
+              "object_type": "memoryPhysicalElement",
+              "attribute": "quantity",
+              "comparator": "gteq",
+              "value": "1"
+          }
+       ]
+    """
+    queries = []
+    for i in json_query:
+        query_struct = {
+            'objectType': i['object_type'],
+            'attribute': i['attribute'],
+            'comparator': i['comparator'],
+            'value': i['value'],
+        }
+        queries.append(query_struct)
+    return 'where={dump}'.format(
+        dump=json.dumps(queries, separators=(',', ':'))
+    )
+
+
+def pem_fingerprint(pem):
+    """SHA-256 fingerprint of the DER content of a PEM key or certificate
+
+    Headers and whitespace are ignored, so two encodings of the same key
+    have the same fingerprint. Returns None for empty or invalid values.
+    """
+    if not pem:
+        return None
+    body = ''.join(
+        line.strip() for line in pem.strip().splitlines()
+        if line.strip() and not line.startswith('-----')
+    )
+    try:
+        der = base64.b64decode(body.encode('ascii'), validate=True)
+    except (ValueError, UnicodeEncodeError):
+        return None
+    return hashlib.sha256(der).hexdigest()
+
+
+def query_options(select_default=None, composition_default=None):
+    """Argument spec of the 'query' option, in the format of json_query_to_url_query"""
+    where_object = dict(
+        object_type=dict(type='str', required=True),
+        attribute=dict(type='str', required=True),
+        comparator=dict(type='str', required=True),
+        value=dict(type='str', required=True),
+    )
+    return dict(
+        select=dict(type='str', required=False, default=select_default),
+        composition=dict(
+            type='str', required=False, default=composition_default, choices=['or', 'and']
+        ),
+        where=dict(
+            type='list',
+            required=True,
+            elements='dict',
+            options=where_object,
+        ),
+    )
+
+
+class RudderApiClient(object):
+    def __init__(self, module, connection=None, raise_errors=False):
+        """
+        Args:
+            module (AnsibleModule): the running module.
+            connection (dict, optional): 'rudder_url', 'rudder_token' and
+                'validate_certs' to use instead of the module parameters.
+            raise_errors (bool, optional): raise RudderApiError instead of
+                exiting the module on errors.
+        """
+        self._module = module
+        self._raise_errors = raise_errors
+        if connection is None:
+            connection = module.params
+
+        if connection.get('rudder_url', None) is None:
+            self.rudder_url = DEFAULT_RUDDER_URL
+            self.validate_certs = False
+        else:
+            self.rudder_url = connection['rudder_url']
+            self.validate_certs = connection.get('validate_certs', True)
+        if connection.get('rudder_token', None) is None:
+            try:
+                with open(SYSTEM_TOKEN_FILE) as system_token:
+                    token = system_token.read()
+            except (IOError, OSError):
+                self.fail(
+                    msg="No token found in parameters, could not find the default system token under '{path}'.".format(path=SYSTEM_TOKEN_FILE),
+                )
+        else:
+            token = connection['rudder_token']
+        self.headers = {
+            'X-API-Token': token,
+            'Content-Type': 'application/json',
+        }
+
+    def fail(self, msg, reason=None):
+        if self._raise_errors:
+            raise RudderApiError(msg if reason is None else '{msg} {reason}'.format(msg=msg, reason=reason))
+        self._module.fail_json(failed=True, msg=msg, reason=reason)
+
+    def get(self, path):
+        """Read an API path with the client token
+
+        Args:
+            path (str): API path
+
+        Returns:
+            dict: request content as a json object.
+        """
+        return self._send_request(path, headers=self.headers, method='GET')
+
+    def _send_request(self, path, data=None, headers=None, method='GET'):
+        """Send HTTP request
+
+        Args:
+            path (str): API path
+            data (dict, optional): JSON data to send.
+            headers (dict, optional): Specify HTTP headers. Defaults to None.
+            method (str, optional): Specify HTTP method. Defaults to "GET".
+
+        Returns:
+            dict: request content as a json object.
+        """
+
+        if data is not None:
+            data = json.dumps(data, sort_keys=True)
+
+        if not headers:
+            headers = []
+
+        full_url = '{rudder_url}{path}'.format(
+            rudder_url=self.rudder_url, path=path
+        )
+
+        try:
+            resp = (
+                open_url(
+                    full_url,
+                    headers=headers,
+                    validate_certs=self.validate_certs,
+                    method=method,
+                    data=data,
+                )
+                .read()
+                .decode('utf8')
+            )
+            return self._module.from_json(resp)
+        except Exception as error:
+            self.fail(msg='Rudder API call failed!', reason=str(error))
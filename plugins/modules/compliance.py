@@ -0,0 +1,318 @@
+#!/usr/bin/python
+# Copyright: (c) 2025, Rudder <dev@rudder.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+DOCUMENTATION = r"""
+module: compliance
+short_description: Report Rudder nodes compliance via APIs
+description:
+    - Report the compliance of Rudder nodes via APIs, aggregated per rule, per policy mode and per state.
+    - Only the aggregates and the list of non-compliant nodes are returned.
+    - The compliance API has no paging, so the compliance of each node is read with one request, and the paging is
+      done by the module. The detailed compliance of a page of nodes is aggregated and discarded before reading the
+      next page, so the memory used for the details depends on O(page_size). The list of the targeted node
+      identifiers and the list of non-compliant nodes still grow with the number of nodes.
+version_added: '1.1.0'
+author: Rudder (@Normation)
+requirements:
+    - 'python >= 2.7'
+
+options:
+  rudder_url:
+    description:
+      - Providing Rudder server IP address. Defaults to localhost.
+    type: str
+
+  rudder_token:
+    description:
+      - Providing Rudder server token. Defaults to the content of /var/rudder/run/api-token if not set.
+    type: str
+
+  validate_certs:
+    description:
+      - Choosing either to ignore or not Rudder certificate validation. Defaults to true.
+    type: bool
+    default: yes
+
+  node_ids:
+    description:
+      - Identifiers of the nodes to report on. When none of C(node_ids), C(group_id) and C(query) is set, all nodes are reported.
+    type: list
+    elements: str
+
+  group_id:
+    description:
+      - Identifier of a node group whose members are reported, see the P(rudder.rudder.node_group#module) module.
+    type: str
+
+  query:
+    description:
+      - The criterion you want to find for your nodes, same format as in the P(rudder.rudder.node_settings#module) module.
+    type: dict
+    suboptions:
+      composition:
+        choices:
+          - or
+          - and
+        type: str
+        description: Boolean operator to use between each where criteria.
+      select:
+        description: What kind of data we want to include. Here we can get policy servers/relay by setting nodeAndPolicyServer. Only used if where is defined.
+        type: str
+      where:
+        type: list
+        description: The criterion you want to find for your nodes.
+        required: true
+        elements: dict
+        suboptions:
+          object_type:
+            description: Object type from which the attribute will be taken.
+            required: true
+            type: str
+          attribute:
+            description: Attribute to compare to value.
+            required: true
+            type: str
+          comparator:
+            description: Comparator type to use.
+            required: true
+            type: str
+          value:
+            type: str
+            required: true
+            description: Value to compare to.
+
+  threshold:
+    description:
+      - Nodes with a compliance strictly lower than this percentage are listed as non-compliant.
+    type: float
+    default: 100
+
+  page_size:
+    description:
+      - Number of nodes whose compliance is requested, with one request per node, and aggregated before
+        requesting the next ones.
+    type: int
+    default: 100
+
+  max_workers:
+    description:
+      - Maximum number of concurrent requests within a page, each request reading the compliance of one node.
+    type: int
+    default: 8
+"""
+
+EXAMPLES = r"""
+- name: Check the compliance of the web servers after converging them
+  compliance:
+      rudder_url: "https://my.rudder.server/rudder"
+      rudder_token: "<rudder_server_token>"
+      group_id: web-servers
+  register: web_compliance
+
+- name: Fail if a node is not fully compliant
+  ansible.builtin.assert:
+    that: web_compliance.non_compliant_nodes | length == 0
+
+- name: Report the compliance of nodes matching a query
+  compliance:
+      rudder_url: "https://my.rudder.server/rudder"
+      rudder_token: "<rudder_server_token>"
+      threshold: 90
+      query:
+        composition: "and"
+        where:
+          - object_type: "node"
+            attribute: "nodeHostname"
+            comparator: "regex"
+            value: "db-.*"
+"""
+
+RETURN = r"""
+compliance:
+  description: Mean compliance percentage of the reported nodes.
+  returned: always
+  type: float
+nodes_count:
+  description: Number of reported nodes.
+  returned: always
+  type: int
+by_rule:
+  description: Mean compliance and number of nodes, by rule identifier.
+  returned: always
+  type: dict
+by_policy_mode:
+  description: Mean compliance and number of nodes, by policy mode as reported in the node compliance, C(unknown) when missing.
+  returned: always
+  type: dict
+by_state:
+  description: Mean percentage of each compliance state over the reported nodes.
+  returned: always
+  type: dict
+non_compliant_nodes:
+  description: Identifier, name and compliance of the nodes below C(threshold).
+  returned: always
+  type: list
+  elements: dict
+errors:
+  description: Nodes whose compliance could not be read.
+  returned: always
+  type: list
+  elements: str
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.rudder_client import (
+    RudderApiClient,
+    RudderApiError,
+    json_query_to_url_query,
+    query_options,
+)
+
+
+__metaclass__ = type
+
+
+class ComplianceAggregator(object):
+    """Running aggregation of node compliance, keeping sums, counters and the non-compliant nodes"""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.nodes_count = 0
+        self.compliance_sum = 0.0
+        self.rules = {}
+        self.policy_modes = {}
+        self.states = {}
+        self.non_compliant_nodes = []
+
+    @staticmethod
+    def _add(bucket, key, compliance, name=None):
+        entry = bucket.setdefault(key, {'compliance_sum': 0.0, 'nodes': 0})
+        entry['compliance_sum'] += compliance
+        entry['nodes'] += 1
+        if name is not None:
+            entry['name'] = name
+
+    def add(self, node):
+        """Aggregate the compliance of one node, as returned by the API with level 2"""
+        compliance = float(node.get('compliance', 0))
+        self.nodes_count += 1
+        self.compliance_sum += compliance
+        self._add(self.policy_modes, node.get('policyMode') or 'unknown', compliance)
+        for state, percent in (node.get('complianceDetails') or {}).items():
+            self.states[state] = self.states.get(state, 0.0) + float(percent)
+        for rule in node.get('rules') or []:
+            self._add(self.rules, rule['id'], float(rule.get('compliance', 0)), rule.get('name'))
+        if compliance < self.threshold:
+            self.non_compliant_nodes.append({
+                'id': node['id'],
+                'name': node.get('name'),
+                'compliance': compliance,
+            })
+
+    @staticmethod
+    def _mean(total, count):
+        return round(total / count, 2) if count else 0.0
+
+    def result(self):
+        def means(bucket):
+            ret = {}
+            for key, entry in bucket.items():
+                ret[key] = dict(entry)
+                ret[key]['compliance'] = self._mean(ret[key].pop('compliance_sum'), entry['nodes'])
+            return ret
+
+        return {
+            'compliance': self._mean(self.compliance_sum, self.nodes_count),
+            'nodes_count': self.nodes_count,
+            'by_rule': means(self.rules),
+            'by_policy_mode': means(self.policy_modes),
+            'by_state': dict(
+                (state, self._mean(total, self.nodes_count))
+                for state, total in self.states.items()
+            ),
+            'non_compliant_nodes': sorted(self.non_compliant_nodes, key=lambda n: n['compliance']),
+        }
+
+
+class RudderComplianceInterface(RudderApiClient):
+    def get_target_nodes(self):
+        """Get the identifiers of the targeted nodes
+
+        The nodes list is only read for a query, or when no target is given.
+
+        Returns:
+            list: node ids.
+        """
+        params = self._module.params
+        if params.get('node_ids') is not None:
+            return list(params['node_ids'])
+        if params.get('group_id') is not None:
+            return self._send_request(
+                '/api/latest/groups/{group_id}'.format(group_id=params['group_id']),
+                headers=self.headers,
+            )['data']['groups'][0]['nodeIds']
+        path = '/api/latest/nodes?include=minimal'
+        if params.get('query') is not None:
+            path += '&' + json_query_to_url_query(params['query']['where'])
+        return [node['id'] for node in self._send_request(path, headers=self.headers)['data']['nodes']]
+
+    def get_node_compliance(self, node_id):
+        return self._send_request(
+            '/api/latest/compliance/nodes/{node_id}?level=2'.format(node_id=node_id),
+            headers=self.headers,
+        )['data']['nodes'][0]
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            rudder_url=dict(type='str', required=False),
+            rudder_token=dict(type='str', required=False, no_log=True),
+            validate_certs=dict(type='bool', required=False, default=True),
+            node_ids=dict(type='list', required=False, elements='str'),
+            group_id=dict(type='str', required=False),
+            query=dict(type='dict', required=False, options=query_options()),
+            threshold=dict(type='float', required=False, default=100),
+            page_size=dict(type='int', required=False, default=100),
+            max_workers=dict(type='int', required=False, default=8),
+        ),
+        mutually_exclusive=[('node_ids', 'group_id', 'query')],
+        supports_check_mode=True,
+    )
+
+    # Errors are raised, the nodes whose compliance can not be read are
+    # reported in 'errors' instead of failing from a worker thread
+    try:
+        rudder_compliance_iface = RudderComplianceInterface(module, raise_errors=True)
+        targets = rudder_compliance_iface.get_target_nodes()
+    except RudderApiError as err:
+        module.fail_json(failed=True, msg='Could not read the targeted nodes', reason=str(err))
+    node_ids = sorted(set(targets))
+    page_size = max(module.params['page_size'], 1)
+
+    aggregator = ComplianceAggregator(module.params['threshold'])
+    errors = []
+    with ThreadPoolExecutor(max_workers=module.params['max_workers']) as executor:
+        for start in range(0, len(node_ids), page_size):
+            page = node_ids[start:start + page_size]
+            futures = [
+                executor.submit(rudder_compliance_iface.get_node_compliance, node_id)
+                for node_id in page
+            ]
+            for node_id, future in zip(page, futures):
+                try:
+                    aggregator.add(future.result())
+                except Exception as err:
+                    errors.append('{node_id}: {err}'.format(node_id=node_id, err=err))
+
+    result = aggregator.result()
+    module.exit_json(failed=bool(errors), changed=False, errors=errors, **result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/python
+# Copyright: (c) 2025, Rudder <dev@rudder.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+DOCUMENTATION = r"""
+module: node_group
+short_description: Manage Rudder node groups via APIs
+description:
+    - Create, update or delete Rudder node groups via APIs.
+    - The group is defined by the same C(query) structure as the P(rudder.rudder.node_settings#module) module.
+      Dynamic groups membership is then maintained by the server, and can be targeted with the C(group_id)
+      option of P(rudder.rudder.node_settings#module) instead of evaluating the query again in each task.
+version_added: '1.1.0'
+author: Rudder (@Normation)
+requirements:
+    - 'python >= 2.7'
+
+options:
+  rudder_url:
+    description:
+      - Providing Rudder server IP address. Defaults to localhost.
+    type: str
+
+  rudder_token:
+    description:
+      - Providing Rudder server token. Defaults to the content of /var/rudder/run/api-token if not set.
+    type: str
+
+  validate_certs:
+    description:
+      - Choosing either to ignore or not Rudder certificate validation. Defaults to true.
+    type: bool
+    default: yes
+
+  id:
+    description:
+      - Identifier of the group. When not set, the group is looked up by its C(name),
+        and created with an identifier generated by the server.
+    type: str
+
+  name:
+    description:
+      - Display name of the group.
+    required: yes
+    type: str
+
+  description:
+    description:
+      - Description of the group.
+    type: str
+    default: ''
+
+  category:
+    description:
+      - Identifier of the category of the group, only used on creation.
+    type: str
+    default: GroupRoot
+
+  dynamic:
+    description:
+      - Whether the group membership is kept up to date by the server (dynamic), or
+        only evaluated when the group is saved (static).
+    type: bool
+    default: yes
+
+  enabled:
+    description:
+      - Whether the group is enabled.
+    type: bool
+    default: yes
+
+  state:
+    description:
+      - Whether the group should exist or not.
+    type: str
+    default: present
+    choices:
+      - present
+      - absent
+
+  query:
+    description:
+      - The criterion defining the group members. Required when C(state=present).
+    type: dict
+    suboptions:
+      composition:
+        choices:
+          - or
+          - and
+        type: str
+        default: and
+        description: Boolean operator to use between each where criteria.
+      select:
+        description: What kind of data we want to include. Here we can get policy servers/relay by setting nodeAndPolicyServer.
+        type: str
+        default: node
+      where:
+        type: list
+        required: yes
+        description: The criterion you want to find for your nodes.
+        elements: dict
+        suboptions:
+          object_type:
+            description: Object type from which the attribute will be taken.
+            required: yes
+            type: str
+          attribute:
+            description: Attribute to compare to value.
+            required: yes
+            type: str
+          comparator:
+            description: Comparator type to use.
+            required: yes
+            type: str
+          value:
+            type: str
+            required: yes
+            description: Value to compare to.
+"""
+
+EXAMPLES = r"""
+- name: Define the web servers group
+  node_group:
+      rudder_url: "https://my.rudder.server/rudder"
+      rudder_token: "<rudder_server_token>"
+      id: web-servers
+      name: "Web servers"
+      query:
+        composition: "and"
+        where:
+          - object_type: "node"
+            attribute: "nodeHostname"
+            comparator: "regex"
+            value: "web-.*"
+
+- name: Configure the members of the group
+  node_settings:
+      rudder_url: "https://my.rudder.server/rudder"
+      rudder_token: "<rudder_server_token>"
+      group_id: web-servers
+      policy_mode: enforce
+
+- name: Remove the group
+  node_group:
+      rudder_url: "https://my.rudder.server/rudder"
+      rudder_token: "<rudder_server_token>"
+      id: web-servers
+      name: "Web servers"
+      state: absent
+"""
+
+RETURN = r"""
+group:
+  description: The group as returned by the API after the changes, empty when absent.
+  returned: always
+  type: dict
+node_ids:
+  description: Identifiers of the members of the group.
+  returned: always
+  type: list
+  elements: str
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.rudder_client import RudderApiClient, query_options
+
+
+__metaclass__ = type
+
+# API group fields managed by the module
+groupSettingsParams = [
+    'displayName',
+    'description',
+    'query',
+    'dynamic',
+    'enabled',
+]
+
+
+def json_query_to_api_query(query):
+    """
+    Translate a query of the form accepted by the node_settings module:
+      {
+          "select": "node",
+          "composition": "and",
+          "where": [
+              {
+                  "object_type": "node",
+                  "attribute": "OS",
+                  "comparator": "eq",
+                  "value": "Linux"
+              }
+          ]
+      }
+    into the group query format of the API.
+    """
+    return {
+        'select': query['select'],
+        'composition': query['composition'].capitalize(),
+        'where': [
+            {
+                'objectType': i['object_type'],
+                'attribute': i['attribute'],
+                'comparator': i['comparator'],
+                'value': i['value'],
+            }
+            for i in query['where']
+        ],
+    }
+
+
+def normalize_api_query(query):
+    """Make API queries comparable, whatever the case of the composition and the extra fields"""
+    if not query:
+        return query
+    return {
+        'select': query.get('select'),
+        'composition': (query.get('composition') or '').lower(),
+        'where': [
+            dict((key, criterion.get(key)) for key in ['objectType', 'attribute', 'comparator', 'value'])
+            for criterion in query.get('where') or []
+        ],
+    }
+
+
+class RudderNodeGroupInterface(RudderApiClient):
+    def expected_group(self):
+        params = self._module.params
+        group = {
+            'displayName': params['name'],
+            'description': params['description'],
+            'dynamic': params['dynamic'],
+            'enabled': params['enabled'],
+            'query': json_query_to_api_query(params['query']),
+        }
+        return group
+
+    def get_group(self, group_id=None, name=None):
+        """Get a group by identifier, or by display name
+
+        Returns:
+            dict: the group, or None if it does not exist.
+        """
+        groups = self._send_request(
+            method='GET', path='/api/latest/groups', headers=self.headers
+        )['data']['groups']
+        for group in groups:
+            if group_id is not None and group['id'] == group_id:
+                return group
+            if group_id is None and group['displayName'] == name:
+                return group
+        return None
+
+    def group_requires_update(self, current, expected):
+        for key in groupSettingsParams:
+            if key == 'query':
+                if normalize_api_query(current.get(key)) != normalize_api_query(expected[key]):
+                    return True
+            elif current.get(key) != expected[key]:
+                return True
+        return False
+
+    def create_group(self, expected):
+        data = dict(expected)
+        data['category'] = self._module.params['category']
+        if self._module.params.get('id') is not None:
+            data['id'] = self._module.params['id']
+        return self._send_request(
+            method='PUT', path='/api/latest/groups', data=data, headers=self.headers
+        )['data']['groups'][0]
+
+    def update_group(self, group_id, expected):
+        return self._send_request(
+            method='POST',
+            path='/api/latest/groups/{group_id}'.format(group_id=group_id),
+            data=expected,
+            headers=self.headers,
+        )['data']['groups'][0]
+
+    def delete_group(self, group_id):
+        self._send_request(
+            method='DELETE',
+            path='/api/latest/groups/{group_id}'.format(group_id=group_id),
+            headers=self.headers,
+        )
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            rudder_url=dict(type='str', required=False),
+            rudder_token=dict(type='str', required=False, no_log=True),
+            validate_certs=dict(type='bool', required=False, default=True),
+            id=dict(type='str', required=False),
+            name=dict(type='str', required=True),
+            description=dict(type='str', required=False, default=''),
+            category=dict(type='str', required=False, default='GroupRoot'),
+            dynamic=dict(type='bool', required=False, default=True),
+            enabled=dict(type='bool', required=False, default=True),
+            state=dict(
+                type='str',
+                required=False,
+                default='present',
+                choices=['present', 'absent'],
+            ),
+            query=dict(
+                type='dict',
+                required=False,
+                options=query_options(select_default='node', composition_default='and'),
+            ),
+        ),
+        required_if=[('state', 'present', ['query'])],
+        supports_check_mode=False,
+    )
+
+    rudder_group_iface = RudderNodeGroupInterface(module)
+    current = rudder_group_iface.get_group(module.params['id'], module.params['name'])
+
+    if module.params['state'] == 'absent':
+        if current is None:
+            module.exit_json(changed=False, group={}, node_ids=[])
+        rudder_group_iface.delete_group(current['id'])
+        module.exit_json(changed=True, group={}, node_ids=[])
+
+    expected = rudder_group_iface.expected_group()
+    if current is None:
+        group = rudder_group_iface.create_group(expected)
+        changed = True
+    elif rudder_group_iface.group_requires_update(current, expected):
+        group = rudder_group_iface.update_group(current['id'], expected)
+        changed = True
+    else:
+        group = current
+        changed = False
+
+    module.exit_json(
+        changed=changed,
+        group=group,
+        node_ids=group.get('nodeIds', []),
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -36,6 +36,27 @@ options:
       - Define the identifier of the node to be configured
     type: str
 
+  group_id:
+    description:
+      - Identifier of a node group whose members are configured, see the P(rudder.rudder.node_group#module) module.
+      - The membership computed by the server is used, instead of evaluating a C(query) in each task.
+      - Ignored when C(node_id) is set, takes precedence over C(policy_server_id) and C(query).
+    type: str
+
+  policy_server_id:
+    description:
+      - Identifier of a policy server (root server or relay) whose nodes are configured, pending ones included.
+      - With C(status), the pending nodes are accepted or refused in bulk, one call per batch of C(batch_size) nodes,
+        then the other settings are applied to the accepted nodes concurrently, within C(max_workers) requests.
+      - Ignored when C(node_id) or C(group_id) is set, takes precedence over C(query).
+    type: str
+
+  batch_size:
+    description:
+      - Number of nodes accepted in one call, and configured before starting the next ones, when targeting a C(policy_server_id).
+    type: int
+    default: 100
+
   policy_mode:
     description:
       - Set the policy mode to (default, enforce or audit)
@@ -96,6 +117,34 @@ options:
         description: Agent key, PEM format
         type: str
 
+  agent_keys:
+    description:
+      - Bulk mode for agent keys and certificates, mapping node identifiers to the expected PEM value.
+      - The fingerprints of the current keys of all nodes are fetched in one call and compared locally,
+        and only the mismatched nodes are updated, concurrently within the C(max_workers) and C(rate_limit) limits.
+      - In this mode, only agent keys are updated, the other node settings are ignored.
+    type: dict
+
+  agent_keys_dir:
+    description:
+      - Directory of C(<node id>.pem) files to use in the agent keys bulk mode, merged with C(agent_keys).
+    type: path
+
+  agent_keys_status:
+    description:
+      - Status of the keys updated in the agent keys bulk mode.
+    type: str
+    default: certified
+    choices:
+      - certified
+      - undefined
+
+  rate_limit:
+    description:
+      - Maximum number of update requests per second in the agent keys bulk mode, C(0) means unlimited.
+    type: float
+    default: 10
+
   include:
     description:
       - Level of information to include from the node inventory.
@@ -119,20 +168,99 @@ options:
       where:
         type: list
         description: The criterion you want to find for your nodes.
+        required: true
         elements: dict
         suboptions:
           object_type:
             description: Object type from which the attribute will be taken.
+            required: true
             type: str
           attribute:
             description: Attribute to compare to value.
+            required: true
             type: str
           comparator:
             description: Comparator type to use.
+            required: true
             type: str
           value:
             type: str
+            required: true
             description: Value to compare to.
+
+  servers:
+    description:
+      - List of Rudder servers to configure concurrently, each with its own credentials.
+      - When set, C(rudder_url), C(rudder_token) and C(validate_certs) are ignored.
+      - Results are returned per server, keyed by C(rudder_url), so each server can only be listed once.
+    type: list
+    elements: dict
+    suboptions:
+      rudder_url:
+        description: Rudder server URL.
+        required: true
+        type: str
+      rudder_token:
+        description: Rudder server token. Defaults to the content of /var/rudder/run/api-token if not set.
+        type: str
+      validate_certs:
+        description: Choosing either to ignore or not Rudder certificate validation.
+        type: bool
+        default: yes
+      node_id:
+        description: Node to configure on this server.
+        type: str
+      group_id:
+        description: Identifier of the node group to configure on this server.
+        type: str
+      policy_server_id:
+        description: Identifier of the policy server whose nodes are configured on this server.
+        type: str
+      query:
+        description:
+          - Query selecting the nodes to configure on this server, with the same format as the top-level C(query).
+          - The top-level C(node_id), C(group_id), C(policy_server_id) and C(query) are used
+            when none of these targets is set for the server.
+        type: dict
+        suboptions:
+          composition:
+            choices:
+              - or
+              - and
+            type: str
+            description: Boolean operator to use between each where criteria.
+          select:
+            description: What kind of data we want to include.
+            type: str
+          where:
+            type: list
+            description: The criterion you want to find for your nodes.
+            required: true
+            elements: dict
+            suboptions:
+              object_type:
+                description: Object type from which the attribute will be taken.
+                required: true
+                type: str
+              attribute:
+                description: Attribute to compare to value.
+                required: true
+                type: str
+              comparator:
+                description: Comparator type to use.
+                required: true
+                type: str
+              value:
+                type: str
+                required: true
+                description: Value to compare to.
+
+  max_workers:
+    description:
+      - Maximum number of servers from C(servers) processed at the same time.
+      - Also the maximum number of concurrent updates in the agent keys bulk mode and when targeting a C(policy_server_id).
+    type: int
+    default: 8
 """
 
 EXAMPLES = r"""
@@ -171,13 +299,60 @@ EXAMPLES = r"""
             attribute: "nodeHostname"
             comparator: "regex"
             value: "rudder-ansible-node.*"
+- name: Modify Rudder Node Settings on several regional servers at once
+  node_settings:
+      policy_mode: enforce
+      query:
+        select: "nodeAndPolicyServer"
+        composition: "and"
+        where:
+          - object_type: "node"
+            attribute: "nodeHostname"
+            comparator: "regex"
+            value: "web-.*"
+      servers:
+        - rudder_url: "https://rudder.eu.example.com/rudder"
+          rudder_token: "<eu_token>"
+        - rudder_url: "https://rudder.us.example.com/rudder"
+          rudder_token: "<us_token>"
+          node_id: root
+- name: Rotate the agent certificates of a fleet from a directory of PEM files
+  node_settings:
+      rudder_url: "https://my.rudder.server/rudder"
+      rudder_token: "<rudder_server_token>"
+      agent_keys_dir: /srv/rudder/certificates
+      rate_limit: 5
+- name: Modify Rudder Node Settings of the members of a group
+  node_settings:
+      rudder_url: "https://my.rudder.server/rudder"
+      rudder_token: "<rudder_server_token>"
+      group_id: web-servers
+      policy_mode: enforce
+- name: Accept and configure all the nodes behind a relay
+  node_settings:
+      rudder_url: "https://my.rudder.server/rudder"
+      rudder_token: "<rudder_server_token>"
+      policy_server_id: "<relay_uuid>"
+      status: accepted
+      policy_mode: enforce
+      batch_size: 200
 """
 
-import json
 import copy
-from ansible.module_utils.urls import open_url
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from ansible.module_utils.basic import AnsibleModule
 
+from ..module_utils.rudder_client import (
+    RudderApiClient,
+    RudderApiError,
+    json_query_to_url_query,
+    pem_fingerprint,
+    query_options,
+)
+
 
 __metaclass__ = type
 
@@ -195,77 +370,66 @@ allParams = [
     'rudder_url',
     'rudder_token',
     'node_id',
+    'group_id',
+    'policy_server_id',
     'include',
     'query',
     'validate_certs',
 ] + nodeSettingsParams
 
 
-def json_query_to_url_query(json_query):
-    """
-    Expects an array of the form:
-      [
-          {
-              "object_type": "node",
-              "attribute": "OS",
-              "comparator": "eq",
-              "value": "Linux"
-          },
-          {
-              "object_type": "node",
-              "attribute": "osFullName",
-              "comparator": "regex",
-              "value": ".*Linux.*"
-          },
-          {
-              "object_type": "memoryPhysicalElement",
-              "attribute": "quantity",
-              "comparator": "gteq",
-              "value": "1"
-          }
-       ]
-    """
-    queries = []
-    for i in json_query:
-        query_struct = {
-            'objectType': i['object_type'],
-            'attribute': i['attribute'],
-            'comparator': i['comparator'],
-            'value': i['value'],
-        }
-        queries.append(query_struct)
-    return 'where={dump}'.format(
-        dump=json.dumps(queries, separators=(',', ':'))
-    )
-
+def load_agent_keys(agent_keys=None, agent_keys_dir=None):
+    """Merge the agent_keys mapping with the <node id>.pem files of agent_keys_dir
 
-class RudderNodeSettingsInterface(object):
-    def __init__(self, module):
-        self._module = module
-        self.validate_certs = True
+    Keys given in the mapping take precedence over the files.
+    """
+    keys = {}
+    if agent_keys_dir is not None:
+        for file_name in sorted(os.listdir(agent_keys_dir)):
+            (node_id, extension) = os.path.splitext(file_name)
+            if extension != '.pem':
+                continue
+            with open(os.path.join(agent_keys_dir, file_name)) as pem_file:
+                keys[node_id] = pem_file.read()
+    keys.update(agent_keys or {})
+    return keys
+
+
+class RateLimiter(object):
+    """Spread calls to wait() so that at most 'rate' of them start per second"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RudderNodeSettingsInterface(RudderApiClient):
+    def __init__(self, module, server=None, raise_errors=False):
+        """
+        Args:
+            module (AnsibleModule): the running module.
+            server (dict, optional): one item of the 'servers' parameter. When
+                given, its connection settings override the module ones and
+                errors are raised as RudderApiError instead of exiting.
+            raise_errors (bool, optional): raise RudderApiError instead of
+                exiting, even without server.
+        """
         self.modified_settings = []
         for param in allParams:
             if param in module.params:
                 setattr(self, param, module.params[param])
-
-        if module.params.get('rudder_url', None) is None:
-            self.rudder_url = 'https://localhost/rudder'
-            self.validate_certs = False
-        if module.params.get('rudder_token', None) is None:
-            try:
-                with open('/var/rudder/run/api-token') as system_token:
-                    token = system_token.read()
-            except FileNotFoundError:
-                self._module.fail_json(
-                    failed=True,
-                    msg="No token found in parameters, could not find the default system token under '/var/rudder/run/api-token'.",
-                )
-        else:
-            token = module.params['rudder_token']
-        self.headers = {
-            'X-API-Token': token,
-            'Content-Type': 'application/json',
-        }
+        super(RudderNodeSettingsInterface, self).__init__(module, server, raise_errors or server is not None)
 
         raw_settings_to_set = {
             param: module.params[param]
@@ -285,47 +449,6 @@ class RudderNodeSettingsInterface(object):
         elif value == 'validate_certs':
             return self.validate_certs
 
-    def _send_request(self, path, data=None, headers=None, method='GET'):
-        """Send HTTP request
-
-        Args:
-            url (str): API path
-            data (str): Specify all JSON data (for example: "{'policyMode':'audit'}").
-            headers (str, optional): Specify HTTP headers. Defaults to None.
-            method (str, optional): Specify HTTP method (GET or POST only). Defaults to "GET".
-
-        Returns:
-            str: return request content as a json object.
-        """
-
-        if data is not None:
-            data = json.dumps(data, sort_keys=True)
-
-        if not headers:
-            headers = []
-
-        full_url = '{rudder_url}{path}'.format(
-            rudder_url=self.rudder_url, path=path
-        )
-
-        try:
-            resp = (
-                open_url(
-                    full_url,
-                    headers=headers,
-                    validate_certs=self.validate_certs,
-                    method=method,
-                    data=data,
-                )
-                .read()
-                .decode('utf8')
-            )
-            return self._module.from_json(resp)
-        except Exception as error:
-            self._module.fail_json(
-                failed=True, msg='Rudder API call failed!', reason=str(error)
-            )
-
     def _translate_settings(self, settings_dict):
         api_formatted_settings = {}
         for key, value in settings_dict.items():
@@ -352,7 +475,7 @@ class RudderNodeSettingsInterface(object):
 
     def properties_require_update(self, node_id, current_node_properties):
         if 'properties' not in self.settings_to_set:
-            return True
+            return False
         for p in self.settings_to_set['properties']:
             key = p['name']
             value = p['value']
@@ -393,18 +516,22 @@ class RudderNodeSettingsInterface(object):
             )
         return update
 
-    def evaluate_node_query(self):
+    def evaluate_node_query(self, query=None):
         """Get all nodes (with query)
 
+        Args:
+            query (dict, optional): Query to evaluate. Defaults to the module 'query' parameter.
+
         Returns:
             str: All nodes who match with query
         """
 
-        query = self._module.params['query']
+        if query is None:
+            query = self._module.params['query']
 
         query_json_struct = {
-            'select': query['select'],
-            'composition': query['composition'],
+            'select': query.get('select'),
+            'composition': query.get('composition'),
         }
 
         url_query = '?' + json_query_to_url_query(query['where'])
@@ -419,118 +546,434 @@ class RudderNodeSettingsInterface(object):
 
         return (url_query, nodes_id)
 
+    def get_group_nodes(self, group_id):
+        """Get the members of a group, as computed by the server
 
-def main():
-    # Definition of the arguments and options
-    # of the 'node_settings' module
-    where_object = dict(
-        object_type=dict(type='str', required=False),
-        attribute=dict(type='str', required=False),
-        comparator=dict(
-            type='str',
-            required=False,
-        ),
-        value=dict(type='str', required=False),
-    )
-    module = AnsibleModule(
-        argument_spec=dict(
-            rudder_url=dict(type='str', required=False),
-            rudder_token=dict(type='str', required=False, no_log=True),
-            node_id=dict(type='str', required=False),
-            properties=dict(
-                type='list',
-                required=False,
-                elements='dict',
-                options=dict(
-                    name=dict(type='str', required=True),
-                    value=dict(type='raw', required=True),
-                ),
-            ),
-            agent_key=dict(
-                type='dict',
-                required=False,
-                no_log=True,
-                options=dict(
-                    value=dict(required=False, type='str'),
-                    status=dict(
-                        type='str',
-                        required=True,
-                        choices=['certified', 'undefined'],
-                    ),
-                ),
-            ),
-            status=dict(
-                type='str', required=False, choices=['accepted', 'refused']
-            ),
-            state=dict(
-                type='str',
-                choices=[
-                    'enabled',
-                    'ignored',
-                    'empty-policies',
-                    'initializing',
-                    'preparing-eol',
-                ],
-                required=False,
-            ),
-            validate_certs=dict(type='bool', required=False, default=True),
-            policy_mode=dict(
-                type='str',
-                choices=['audit', 'enforce', 'default', 'keep'],
-                required=False,
-            ),
-            include=dict(type='str', required=False, default='default'),
-            query=dict(
-                type='dict',
-                required=False,
-                options=dict(
-                    select=dict(type='str', required=False),
-                    composition=dict(
-                        type='str', required=False, choices=['or', 'and']
-                    ),
-                    where=dict(
-                        type='list',
-                        required=False,
-                        elements='dict',
-                        options=where_object,
-                    ),
-                ),
-            ),
-        ),
-        supports_check_mode=False,
-    )
+        Returns:
+            list: identifiers of the nodes of the group.
+        """
+        return self._send_request(
+            method='GET',
+            path='/api/latest/groups/{group_id}'.format(group_id=group_id),
+            headers=self.headers,
+        )['data']['groups'][0]['nodeIds']
+
+    def get_policy_server_nodes(self, policy_server_id):
+        """Get the pending and accepted nodes of a policy server
+
+        Returns:
+            tuple: (pending node ids, accepted node ids)
+        """
+        pending = self._send_request(
+            method='GET',
+            path='/api/latest/nodes/pending?include=minimal,policyServerId',
+            headers=self.headers,
+        )['data']['nodes']
+        url_query = json_query_to_url_query([{
+            'object_type': 'node',
+            'attribute': 'policyServerId',
+            'comparator': 'eq',
+            'value': policy_server_id,
+        }])
+        accepted = self._send_request(
+            method='GET',
+            path='/api/latest/nodes?include=minimal&{}'.format(url_query),
+            headers=self.headers,
+        )['data']['nodes']
+        return (
+            [node['id'] for node in pending if node.get('policyServerId') == policy_server_id],
+            [node['id'] for node in accepted],
+        )
 
-    rudder_node_iface = RudderNodeSettingsInterface(module)
+    def set_pending_nodes_status(self, node_ids, status):
+        """Accept or refuse several pending nodes in one call"""
+        self._send_request(
+            path='/api/latest/nodes/pending',
+            data={'nodeId': node_ids, 'status': status},
+            headers=self.headers,
+            method='POST',
+        )
+        for node_id in node_ids:
+            self.modified_settings.append({node_id: {'status': status}})
 
-    # Define the target nodes
-    query = ''
+    def get_agent_keys(self):
+        """Get the agent key of all nodes in one call
+
+        Returns:
+            dict: agent key ('status' and 'value') by node id.
+        """
+        nodes = self._send_request(
+            method='GET',
+            path='/api/latest/nodes?include=minimal,agentKey',
+            headers=self.headers,
+        )['data']['nodes']
+        return {node['id']: node.get('agentKey') or {} for node in nodes}
+
+    def set_agent_key(self, node_id, value, status):
+        self._send_request(
+            path='/api/latest/nodes/{node_id}'.format(node_id=node_id),
+            data={'agentKey': {'status': status, 'value': value}},
+            headers=self.headers,
+            method='POST',
+        )
+        self.modified_settings.append({
+            node_id: {
+                'agentKey': {'status': status, 'fingerprint': pem_fingerprint(value)}
+            }
+        })
+
+
+def converge_nodes(rudder_node_iface, node_id=None, query=None, group_id=None):
+    """Apply the expected settings on the targeted nodes of one server
+
+    Args:
+        rudder_node_iface (RudderNodeSettingsInterface): interface of the server.
+        node_id (str, optional): node to configure, takes precedence over the group and the query.
+        query (dict, optional): query selecting the nodes to configure.
+        group_id (str, optional): group whose members are configured, takes precedence over the query.
+
+    Returns:
+        dict: changed status, per node status, evaluated query and errors.
+    """
+    url_query = ''
     target_nodes = []
-    if module.params.get('node_id', None) is not None:
-        target_nodes.append(module.params['node_id'])
+    if node_id is not None:
+        target_nodes.append(node_id)
+    elif group_id is not None:
+        target_nodes = rudder_node_iface.get_group_nodes(group_id)
     else:
-        (query, target_nodes) = rudder_node_iface.evaluate_node_query()
+        (url_query, target_nodes) = rudder_node_iface.evaluate_node_query(query)
 
     changed = False
     impacted_nodes = {i: False for i in target_nodes}
     errors = []
-    for node_id in target_nodes:
+    for target in target_nodes:
         try:
-            node_changed = rudder_node_iface.set_node_settings(node_id)
+            node_changed = rudder_node_iface.set_node_settings(target)
             changed = node_changed or changed
-            impacted_nodes[node_id] = node_changed
+            impacted_nodes[target] = node_changed
         except Exception as err:
             errors.append(err)
 
-    failed = bool(errors)
+    return {
+        'changed': changed,
+        'nodes': impacted_nodes,
+        'query': url_query,
+        'errors': errors,
+    }
+
+
+def converge_agent_keys(rudder_node_iface, module):
+    """Update the agent keys that do not match the expected ones on one server
+
+    The current keys are fetched in one call and compared by fingerprint, then
+    only the mismatched nodes are updated through a pool of 'max_workers'
+    threads, limited to 'rate_limit' requests per second.
+
+    Returns:
+        dict: changed status, per node status, evaluated query and errors.
+    """
+    expected_keys = load_agent_keys(
+        module.params.get('agent_keys'), module.params.get('agent_keys_dir')
+    )
+    status = module.params['agent_keys_status']
+    current_keys = rudder_node_iface.get_agent_keys()
+
+    impacted_nodes = {node_id: False for node_id in expected_keys}
+    errors = []
+    to_update = []
+    for node_id, value in expected_keys.items():
+        if node_id not in current_keys:
+            errors.append('Node {node_id} not found'.format(node_id=node_id))
+            continue
+        if pem_fingerprint(value) is None:
+            errors.append('Invalid PEM value for node {node_id}'.format(node_id=node_id))
+            continue
+        current = current_keys[node_id]
+        if current.get('status') != status or pem_fingerprint(current.get('value')) != pem_fingerprint(value):
+            to_update.append(node_id)
+
+    rate_limiter = RateLimiter(module.params['rate_limit'])
+
+    def update(node_id):
+        rate_limiter.wait()
+        rudder_node_iface.set_agent_key(node_id, expected_keys[node_id], status)
+
+    with ThreadPoolExecutor(max_workers=module.params['max_workers']) as executor:
+        futures = {executor.submit(update, node_id): node_id for node_id in to_update}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                impacted_nodes[futures[future]] = True
+            except Exception as err:
+                errors.append('{node_id}: {err}'.format(node_id=futures[future], err=err))
+
+    return {
+        'changed': any(impacted_nodes.values()),
+        'nodes': impacted_nodes,
+        'query': '',
+        'errors': errors,
+    }
+
+
+def converge_policy_server_nodes(rudder_node_iface, module, policy_server_id):
+    """Accept and configure the nodes of a policy server, in parallel batches
+
+    The pending nodes are accepted or refused with one call per batch, then
+    the other settings are applied to the accepted nodes through a pool of
+    'max_workers' threads, one batch after the other.
+
+    Returns:
+        dict: changed status, per node status, evaluated query and errors.
+    """
+    (pending, accepted) = rudder_node_iface.get_policy_server_nodes(policy_server_id)
+    batch_size = max(module.params['batch_size'], 1)
+    status = rudder_node_iface.settings_to_set.get('status')
+
+    impacted_nodes = {node_id: False for node_id in pending + accepted}
+    errors = []
+    targets = list(accepted)
+    if status is not None:
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            try:
+                rudder_node_iface.set_pending_nodes_status(batch, status)
+            except RudderApiError as err:
+                errors.append(str(err))
+                continue
+            for node_id in batch:
+                impacted_nodes[node_id] = True
+            if status == 'accepted':
+                targets.extend(batch)
+
+    if any(key != 'status' for key in rudder_node_iface.settings_to_set):
+        with ThreadPoolExecutor(max_workers=module.params['max_workers']) as executor:
+            for start in range(0, len(targets), batch_size):
+                batch = targets[start:start + batch_size]
+                futures = [executor.submit(rudder_node_iface.set_node_settings, node_id) for node_id in batch]
+                for node_id, future in zip(batch, futures):
+                    try:
+                        impacted_nodes[node_id] = future.result() or impacted_nodes[node_id]
+                    except Exception as err:
+                        errors.append('{node_id}: {err}'.format(node_id=node_id, err=err))
+
+    return {
+        'changed': any(impacted_nodes.values()),
+        'nodes': impacted_nodes,
+        'query': '',
+        'errors': errors,
+    }
+
+
+def agent_keys_bulk_mode(module):
+    return module.params.get('agent_keys') is not None or module.params.get('agent_keys_dir') is not None
+
+
+def converge_targets(rudder_node_iface, module, node_id=None, query=None, group_id=None, policy_server_id=None):
+    """Apply the expected settings on one server, in the mode matching the parameters
+
+    Returns:
+        dict: changed status, per node status, evaluated query and errors.
+    """
+    if agent_keys_bulk_mode(module):
+        return converge_agent_keys(rudder_node_iface, module)
+    if node_id is None and group_id is None and policy_server_id is not None:
+        return converge_policy_server_nodes(rudder_node_iface, module, policy_server_id)
+    return converge_nodes(rudder_node_iface, node_id, query, group_id)
+
+
+def check_unique_servers(module):
+    """Fail if a server is listed twice, as results are keyed by server URL"""
+    urls = [server['rudder_url'] for server in module.params['servers']]
+    duplicates = sorted(set(url for url in urls if urls.count(url) > 1))
+    if duplicates:
+        module.fail_json(
+            failed=True,
+            msg='Each server can only be listed once in servers, found duplicates: {urls}'.format(urls=', '.join(duplicates)),
+        )
+
+
+def converge_servers(module):
+    """Run converge_targets concurrently on every item of the 'servers' parameter
+
+    Each server gets its own interface, and therefore its own connections, so a
+    slow or failing server does not delay nor abort the others.
+
+    Returns:
+        dict: per server result, keyed by server URL.
+    """
+    check_unique_servers(module)
+
+    def converge_server(server):
+        rudder_node_iface = RudderNodeSettingsInterface(module, server)
+        targets = ['node_id', 'query', 'group_id', 'policy_server_id']
+        if all(server.get(target) is None for target in targets):
+            targets = dict((target, module.params.get(target)) for target in targets)
+        else:
+            targets = dict((target, server.get(target)) for target in targets)
+        result = converge_targets(rudder_node_iface, module, **targets)
+        result['modified_settings'] = rudder_node_iface.modified_settings
+        result['errors'] = [str(err) for err in result['errors']]
+        result['failed'] = bool(result['errors'])
+        return result
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=module.params['max_workers']) as executor:
+        futures = {
+            executor.submit(converge_server, server): server['rudder_url']
+            for server in module.params['servers']
+        }
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as err:
+                results[futures[future]] = {
+                    'changed': False,
+                    'failed': True,
+                    'nodes': {},
+                    'modified_settings': [],
+                    'query': '',
+                    'errors': [str(err)],
+                }
+    return results
+
+
+def argument_spec():
+    # Definition of the arguments and options
+    # of the 'node_settings' module, the query options are
+    # shared by the top-level and the per server queries
+    node_query_options = query_options()
+    return dict(
+        rudder_url=dict(type='str', required=False),
+        rudder_token=dict(type='str', required=False, no_log=True),
+        node_id=dict(type='str', required=False),
+        group_id=dict(type='str', required=False),
+        policy_server_id=dict(type='str', required=False),
+        batch_size=dict(type='int', required=False, default=100),
+        properties=dict(
+            type='list',
+            required=False,
+            elements='dict',
+            options=dict(
+                name=dict(type='str', required=True),
+                value=dict(type='raw', required=True),
+            ),
+        ),
+        agent_key=dict(
+            type='dict',
+            required=False,
+            no_log=True,
+            options=dict(
+                value=dict(required=False, type='str'),
+                status=dict(
+                    type='str',
+                    required=True,
+                    choices=['certified', 'undefined'],
+                ),
+            ),
+        ),
+        status=dict(
+            type='str', required=False, choices=['accepted', 'refused']
+        ),
+        state=dict(
+            type='str',
+            choices=[
+                'enabled',
+                'ignored',
+                'empty-policies',
+                'initializing',
+                'preparing-eol',
+            ],
+            required=False,
+        ),
+        validate_certs=dict(type='bool', required=False, default=True),
+        policy_mode=dict(
+            type='str',
+            choices=['audit', 'enforce', 'default', 'keep'],
+            required=False,
+        ),
+        agent_keys=dict(type='dict', required=False, no_log=True),
+        agent_keys_dir=dict(type='path', required=False),
+        agent_keys_status=dict(
+            type='str',
+            required=False,
+            default='certified',
+            choices=['certified', 'undefined'],
+        ),
+        rate_limit=dict(type='float', required=False, default=10),
+        include=dict(type='str', required=False, default='default'),
+        query=dict(type='dict', required=False, options=node_query_options),
+        servers=dict(
+            type='list',
+            required=False,
+            elements='dict',
+            options=dict(
+                rudder_url=dict(type='str', required=True),
+                rudder_token=dict(type='str', required=False, no_log=True),
+                validate_certs=dict(type='bool', required=False, default=True),
+                node_id=dict(type='str', required=False),
+                group_id=dict(type='str', required=False),
+                policy_server_id=dict(type='str', required=False),
+                query=dict(type='dict', required=False, options=node_query_options),
+            ),
+        ),
+        max_workers=dict(type='int', required=False, default=8),
+    )
+
+
+def argument_constraints():
+    # Also applied by the batch command line, next to argument_spec()
+    return dict(
+        mutually_exclusive=[
+            ('agent_keys', 'agent_key'),
+            ('agent_keys_dir', 'agent_key'),
+        ],
+    )
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=False,
+        **argument_constraints()
+    )
+
+    if module.params.get('servers'):
+        servers = converge_servers(module)
+        module.exit_json(
+            failed=any(s['failed'] for s in servers.values()),
+            changed=any(s['changed'] for s in servers.values()),
+            meta=module.params,
+            servers=servers,
+        )
+
+    # The concurrent modes must not exit from a worker thread, their errors
+    # are raised and reported per node instead
+    raise_errors = agent_keys_bulk_mode(module) or module.params.get('policy_server_id') is not None
+    try:
+        rudder_node_iface = RudderNodeSettingsInterface(module, raise_errors=raise_errors)
+
+        # Define the target nodes
+        result = converge_targets(
+            rudder_node_iface,
+            module,
+            module.params.get('node_id', None),
+            module.params.get('query', None),
+            module.params.get('group_id', None),
+            module.params.get('policy_server_id', None),
+        )
+    except (RudderApiError, OSError) as err:
+        module.fail_json(failed=True, msg='Could not configure the nodes', reason=str(err))
+
     module.exit_json(
-        failed=failed,
-        changed=changed,
+        failed=bool(result['errors']),
+        changed=result['changed'],
         meta=module.params,
         expected_settings=rudder_node_iface.settings_to_set,
         modified_settings=rudder_node_iface.modified_settings,
-        nodes=impacted_nodes,
-        query=query,
-        errors=errors,
+        nodes=result['nodes'],
+        query=result['query'],
+        errors=[str(err) for err in result['errors']],
     )
 
 
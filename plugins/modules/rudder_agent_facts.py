@@ -0,0 +1,128 @@
+#!/usr/bin/python
+# Copyright: (c) 2025, Rudder <dev@rudder.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+DOCUMENTATION = r"""
+module: rudder_agent_facts
+short_description: Gather facts about the local Rudder agent
+description:
+    - Read the installed Rudder agent version, node UUID, policy server and key fingerprints
+      in one call, and return them as the C(rudder_agent) fact.
+    - The fingerprints are computed the same way as in the P(rudder.rudder.node_settings#module) module,
+      so they can be compared with the expected keys of its agent keys bulk mode.
+version_added: '1.1.0'
+author: Rudder (@Normation)
+requirements:
+    - 'python >= 2.7'
+
+options:
+  package:
+    description:
+      - Name of the package providing the agent.
+    type: str
+    default: rudder-agent
+"""
+
+EXAMPLES = r"""
+- name: Gather Rudder agent facts
+  rudder_agent_facts:
+
+- name: Show the node UUID
+  ansible.builtin.debug:
+    msg: "{{ ansible_facts.rudder_agent.uuid }}"
+"""
+
+RETURN = r"""
+ansible_facts:
+  description: Facts about the local Rudder agent.
+  returned: always
+  type: complex
+  contains:
+    rudder_agent:
+      description: Facts about the local Rudder agent.
+      returned: always
+      type: complex
+      contains:
+        installed:
+          description: Whether the agent package is installed.
+          type: bool
+        version:
+          description: Installed version of the agent package, null if not installed.
+          type: str
+        uuid:
+          description: Node UUID, null if not defined yet.
+          type: str
+        policy_server:
+          description: Configured policy server, null if not defined.
+          type: str
+        key_fingerprint:
+          description: SHA-256 fingerprint of the agent public key, null if there is none.
+          type: str
+        certificate_fingerprint:
+          description: SHA-256 fingerprint of the agent certificate, null if there is none.
+          type: str
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.rudder_client import pem_fingerprint
+
+
+__metaclass__ = type
+
+UUID_FILE = '/opt/rudder/etc/uuid.hive'
+POLICY_SERVER_FILE = '/var/rudder/cfengine-community/policy_server.dat'
+KEY_FILE = '/var/rudder/cfengine-community/ppkeys/localhost.pub'
+CERTIFICATE_FILE = '/opt/rudder/etc/ssl/agent.cert'
+
+
+def read_file(path):
+    """Content of a file without surrounding whitespace, None if missing or empty"""
+    try:
+        with open(path) as f:
+            return f.read().strip() or None
+    except (IOError, OSError):
+        return None
+
+
+def package_version(module, package):
+    """Installed version of a package, None if it is not installed"""
+    dpkg_query = module.get_bin_path('dpkg-query')
+    if dpkg_query is not None:
+        rc, out, err = module.run_command([dpkg_query, '-W', '-f=${Status} ${Version}', package])
+        if rc == 0 and out.startswith('install ok installed'):
+            return out.split()[-1]
+        return None
+    rpm = module.get_bin_path('rpm')
+    if rpm is not None:
+        rc, out, err = module.run_command([rpm, '-q', '--qf', '%{VERSION}-%{RELEASE}', package])
+        if rc == 0:
+            return out.strip()
+        return None
+    module.fail_json(msg='Could not find dpkg-query nor rpm to read the installed agent version')
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            package=dict(type='str', required=False, default='rudder-agent'),
+        ),
+        supports_check_mode=True,
+    )
+
+    version = package_version(module, module.params['package'])
+    facts = {
+        'installed': version is not None,
+        'version': version,
+        'uuid': read_file(UUID_FILE),
+        'policy_server': read_file(POLICY_SERVER_FILE),
+        'key_fingerprint': pem_fingerprint(read_file(KEY_FILE)),
+        'certificate_fingerprint': pem_fingerprint(read_file(CERTIFICATE_FILE)),
+    }
+    module.exit_json(changed=False, ansible_facts={'rudder_agent': facts})
+
+
+if __name__ == '__main__':
+    main()
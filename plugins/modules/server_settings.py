@@ -48,6 +48,37 @@ options:
     type: bool
     default: yes
 
+  servers:
+    description:
+      - List of Rudder servers to configure concurrently, each with its own credentials.
+      - When set, C(rudder_url), C(rudder_token) and C(validate_certs) are ignored.
+      - Results are returned per server, keyed by C(rudder_url), so each server can only be listed once.
+    required: false
+    type: list
+    elements: dict
+    suboptions:
+      rudder_url:
+        description: Rudder server URL.
+        required: true
+        type: str
+      rudder_token:
+        description: Rudder server token. Defaults to the content of /var/rudder/run/api-token if not set.
+        type: str
+      validate_certs:
+        description: Choosing either to ignore or not Rudder certificate validation.
+        type: bool
+        default: yes
+      value:
+        description: Value to set on this server instead of the top-level C(value).
+        type: raw
+
+  max_workers:
+    description:
+      - Maximum number of servers from C(servers) processed at the same time.
+    required: false
+    type: int
+    default: 8
+
 """
 
 EXAMPLES = r"""
@@ -71,14 +102,28 @@ EXAMPLES = r"""
       name: "allowed_networks/root"
       value:
         - "192.168.0.0/16"
+
+- name: Modify Rudder Settings on several regional servers at once
+  server_settings:
+      name: "modified_file_ttl"
+      value: "30"
+      servers:
+        - rudder_url: "https://rudder.eu.example.com/rudder"
+          rudder_token: "<eu_token>"
+        - rudder_url: "https://rudder.us.example.com/rudder"
+          rudder_token: "<us_token>"
+          value: "45"
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.error import HTTPError
 from ansible.module_utils.urls import open_url
 
 from ansible.module_utils.basic import AnsibleModule
 
+from ..module_utils.rudder_client import RudderApiError
+
 __metaclass__ = type
 
 # Ansible module parameters
@@ -86,18 +131,20 @@ allParams = ['rudder_url', 'rudder_token', 'name', 'value', 'validate_certs']
 
 
 class RudderSettingsInterface(object):
-    def __init__(self, module):
+    def __init__(self, module, server=None):
         self._module = module
+        self._server = server
         self.validate_certs = True
         self.variables = {
             'raw_value': [],
             'requests': []
         }
+        connection = server if server is not None else module.params
 
-        self.rudder_url = module.params['rudder_url']
-        self.validate_certs = module.params['validate_certs']
+        self.rudder_url = connection['rudder_url']
+        self.validate_certs = connection['validate_certs']
 
-        if module.params.get('rudder_token', None) is None:
+        if connection.get('rudder_token', None) is None:
             try:
                 with open('/var/rudder/run/api-token') as system_token:
                     token = system_token.read()
@@ -107,7 +154,7 @@ class RudderSettingsInterface(object):
                     exception=str(e)
                 )
         else:
-            token = module.params['rudder_token']
+            token = connection['rudder_token']
         self.headers = {
             'X-API-Token': token,
             'Content-Type': 'application/json',
@@ -125,6 +172,8 @@ class RudderSettingsInterface(object):
             return self.validate_certs
 
     def fail(self, msg, exception):
+        if self._server is not None:
+            raise RudderApiError(msg if exception is None else '{msg} {exception}'.format(msg=msg, exception=exception))
         self._module.fail_json(
             changed=False,
             failed=True,
@@ -204,6 +253,8 @@ class RudderSettingsInterface(object):
                 return raw_value['data']['allowed_networks']
             else:
                 return raw_value['data']['settings'][name]
+        except RudderApiError:
+            raise
         except Exception as e:
             self.fail(
                 msg="Could not read settings value from the API",
@@ -219,60 +270,163 @@ class RudderSettingsInterface(object):
         )
 
 
-def main():
-    module = AnsibleModule(
-        argument_spec={
-            'rudder_url': {
-                'type': 'str',
-                'required': False,
-                'default': 'https://localhost/rudder',
-            },
-            'rudder_token': {'type': 'str', 'required': False, "no_log": True},
-            'name': {'type': 'str', 'required': True},
-            'value': {'type': 'raw', 'required': True},
-            'validate_certs': {'type': 'bool', 'default': True},
-        },
-        supports_check_mode=False,
-    )
-
-    rudder_url = module.params['rudder_url']
-    rudder_token = module.params['rudder_token']
-    name = module.params['name']
-    value = module.params['value']
+def parse_value(module, value):
     if isinstance(value, str):
         try:
-            value = module.from_json(module.params['value'])
+            value = module.from_json(value)
         except Exception:
             # value = value
             pass
+    return value
 
-    rudder_server_iface = RudderSettingsInterface(module)
 
+def converge_setting(rudder_server_iface, name, value):
+    """Set a setting on one server if it does not already have the expected value
+
+    Returns:
+        tuple: (changed, message)
+    """
     OLD_VALUE = rudder_server_iface.get_SettingValue(name)
     rudder_server_iface.log_variable('old_value', OLD_VALUE)
 
     # For common settings
     if rudder_server_iface.compare_settings_value(value, OLD_VALUE):
-        rudder_server_iface.success(
-            changed=False,
-            msg='Already correct'
-        )
+        return (False, 'Already correct')
 
     rudder_server_iface.set_SettingValue(name, value)
     NEW_VALUE = rudder_server_iface.get_SettingValue(name)
     rudder_server_iface.log_variable('new_value', NEW_VALUE)
 
     if rudder_server_iface.compare_settings_value(value, NEW_VALUE):
-        rudder_server_iface.success(
-            changed=True,
-            msg='Settings successfully updated'
+        return (True, 'Settings successfully updated')
+    rudder_server_iface.fail(
+        msg='Could not apply the expected settings',
+        exception=None
+    )
+
+
+def check_unique_servers(module):
+    """Fail if a server is listed twice, as results are keyed by server URL"""
+    urls = [server['rudder_url'] for server in module.params['servers']]
+    duplicates = sorted(set(url for url in urls if urls.count(url) > 1))
+    if duplicates:
+        module.fail_json(
+            changed=False,
+            failed=True,
+            msg='Each server can only be listed once in servers, found duplicates: {urls}'.format(urls=', '.join(duplicates)),
         )
-    else:
-        rudder_server_iface.fail(
-            msg='Could not apply the expected settings',
-            exception=None
+
+
+def converge_servers(module, name, value):
+    """Run converge_setting concurrently on every item of the 'servers' parameter
+
+    Each server gets its own interface, and therefore its own connections, so a
+    slow or failing server does not delay nor abort the others.
+
+    Returns:
+        dict: per server result, keyed by server URL.
+    """
+    check_unique_servers(module)
+
+    def converge_server(server, rudder_server_iface):
+        server_value = value
+        if server.get('value', None) is not None:
+            server_value = parse_value(module, server['value'])
+        (changed, msg) = converge_setting(rudder_server_iface, name, server_value)
+        return {
+            'changed': changed,
+            'failed': False,
+            'message': msg,
+            'variables': rudder_server_iface.variables,
+        }
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=module.params['max_workers']) as executor:
+        futures = {}
+        for server in module.params['servers']:
+            try:
+                rudder_server_iface = RudderSettingsInterface(module, server)
+            except RudderApiError as e:
+                results[server['rudder_url']] = {
+                    'changed': False,
+                    'failed': True,
+                    'message': str(e),
+                    'variables': {},
+                }
+                continue
+            future = executor.submit(converge_server, server, rudder_server_iface)
+            futures[future] = (server['rudder_url'], rudder_server_iface)
+        for future in as_completed(futures):
+            (url, rudder_server_iface) = futures[future]
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                results[url] = {
+                    'changed': False,
+                    'failed': True,
+                    'message': str(e),
+                    'variables': rudder_server_iface.variables,
+                }
+    return results
+
+
+def argument_spec():
+    return {
+        'rudder_url': {
+            'type': 'str',
+            'required': False,
+            'default': 'https://localhost/rudder',
+        },
+        'rudder_token': {'type': 'str', 'required': False, "no_log": True},
+        'name': {'type': 'str', 'required': True},
+        'value': {'type': 'raw', 'required': True},
+        'validate_certs': {'type': 'bool', 'default': True},
+        'servers': {
+            'type': 'list',
+            'required': False,
+            'elements': 'dict',
+            'options': {
+                'rudder_url': {'type': 'str', 'required': True},
+                'rudder_token': {'type': 'str', 'required': False, "no_log": True},
+                'validate_certs': {'type': 'bool', 'default': True},
+                'value': {'type': 'raw', 'required': False},
+            },
+        },
+        'max_workers': {'type': 'int', 'required': False, 'default': 8},
+    }
+
+
+def argument_constraints():
+    # Also applied by the batch command line, next to argument_spec()
+    return dict()
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=False,
+        **argument_constraints()
+    )
+
+    name = module.params['name']
+    value = parse_value(module, module.params['value'])
+
+    if module.params.get('servers'):
+        servers = converge_servers(module, name, value)
+        module.exit_json(
+            failed=any(s['failed'] for s in servers.values()),
+            changed=any(s['changed'] for s in servers.values()),
+            servers=servers,
         )
 
+    rudder_server_iface = RudderSettingsInterface(module)
+
+    (changed, msg) = converge_setting(rudder_server_iface, name, value)
+    rudder_server_iface.success(
+        changed=changed,
+        msg=msg
+    )
+
 
 if __name__ == '__main__':
     main()
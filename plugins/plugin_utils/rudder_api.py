@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2025, Rudder <dev@rudder.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Controller side helpers to reuse the modules API interfaces outside of a module run"""
+
+from __future__ import absolute_import, division, print_function
+
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+
+__metaclass__ = type
+
+
+class RudderModuleError(Exception):
+    """Raised by ModuleShim when an interface would have failed the module"""
+
+    def __init__(self, msg, result=None):
+        super(RudderModuleError, self).__init__(msg)
+        self.result = result or {}
+
+
+class ApiCacheError(Exception):
+    """Raised when the on-disk cache directory can not be trusted"""
+
+
+class ModuleShim(object):
+    """Minimal stand-in for AnsibleModule, as used by the API interfaces
+
+    The interfaces only need 'params', 'from_json' and 'fail_json'/'exit_json',
+    so they can be driven from lookups or scripts with a plain dict of parameters.
+    Failures raise RudderModuleError instead of exiting the process.
+    """
+
+    def __init__(self, params):
+        self.params = params
+
+    def from_json(self, data):
+        return json.loads(data)
+
+    def fail_json(self, msg=None, **kwargs):
+        kwargs['msg'] = msg
+        raise RudderModuleError(msg, kwargs)
+
+    def exit_json(self, **kwargs):
+        return kwargs
+
+
+class ApiCache(object):
+    """Memoize API answers for the current process, optionally on disk
+
+    Values are kept in memory for the life of the process, which only helps
+    within one worker: Ansible templates each host in a forked worker, whose
+    memory is discarded afterwards. When 'ttl' is greater than 0 the values are
+    also written to 'cache_dir', so that the workers running the same lookup for
+    other hosts reuse the first answer instead of querying the server again. A
+    lock file makes concurrent workers wait for the first fetch rather than all
+    fetching at the same time.
+
+    The cached answers can be sensitive, so the directory must belong to the
+    current user and must not be writable by anyone else.
+    """
+
+    _memory = {}
+    _memory_lock = threading.Lock()
+
+    def __init__(self, ttl=0, cache_dir=None):
+        self.ttl = ttl
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser('~'), '.ansible', 'tmp', 'rudder_api_cache')
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+    def _check_dir(self):
+        try:
+            os.makedirs(self.cache_dir, 0o700)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        st = os.lstat(self.cache_dir)
+        if not stat.S_ISDIR(st.st_mode):
+            raise ApiCacheError('Cache directory {path} is not a directory'.format(path=self.cache_dir))
+        if st.st_uid != os.geteuid():
+            raise ApiCacheError('Cache directory {path} is not owned by the current user'.format(path=self.cache_dir))
+        if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise ApiCacheError('Cache directory {path} is writable by other users'.format(path=self.cache_dir))
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def _read_disk(self, key):
+        try:
+            with open(self._path(key)) as cache_file:
+                entry = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+        if time.time() - entry.get('time', 0) > self.ttl:
+            return None
+        return entry
+
+    def _write_disk(self, key, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump({'time': time.time(), 'value': value}, cache_file)
+        os.rename(tmp_path, self._path(key))
+
+    def get(self, key, fetch):
+        """Return the cached value for key, calling fetch() on a miss"""
+        with self._memory_lock:
+            if key in self._memory:
+                return self._memory[key]
+
+        if self.ttl <= 0:
+            value = fetch()
+        else:
+            self._check_dir()
+            with open(self._path(key) + '.lock', 'w') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    entry = self._read_disk(key)
+                    if entry is not None:
+                        value = entry['value']
+                    else:
+                        value = fetch()
+                        self._write_disk(key, value)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+        with self._memory_lock:
+            self._memory[key] = value
+        return value
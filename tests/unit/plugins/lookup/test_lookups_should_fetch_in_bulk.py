@@ -0,0 +1,99 @@
+from __future__ import absolute_import, division, print_function
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from ansible.errors import AnsibleLookupError
+from plugins.lookup import node_property, setting
+from plugins.module_utils import rudder_client
+from plugins.plugin_utils.rudder_api import ApiCache
+
+__metaclass__ = type
+
+NODES = [
+    {'id': 'node1', 'hostname': 'web-1', 'properties': [{'name': 'env', 'value': 'prod'}]},
+    {'id': 'node2', 'hostname': 'web-2', 'properties': []},
+]
+SETTINGS = {'modified_file_ttl': 30}
+
+
+class FakeClient(object):
+    requests = []
+
+    def __init__(self, module):
+        self.module = module
+
+    def get(self, path):
+        FakeClient.requests.append(path)
+        if path.startswith('/api/latest/nodes'):
+            return {'data': {'nodes': NODES}}
+        if path.startswith('/api/latest/settings/allowed_networks'):
+            return {'data': {'allowed_networks': ['192.168.0.0/16']}}
+        return {'data': {'settings': SETTINGS}}
+
+
+def make_lookup(plugin, **options):
+    options.setdefault('rudder_url', 'https://rudder.example.com/rudder')
+    options.setdefault('validate_certs', True)
+    options.setdefault('cache_ttl', 0)
+    lookup = plugin.LookupModule()
+    lookup.set_options = mock.Mock()
+    lookup.get_option = lambda name: options.get(name)
+    return lookup
+
+
+class TestLookups(unittest.TestCase):
+    def setUp(self):
+        ApiCache._memory.clear()
+        self.addCleanup(ApiCache._memory.clear)
+        FakeClient.requests = []
+        for plugin in [node_property, setting]:
+            patcher = mock.patch.object(plugin, 'RudderApiClient', FakeClient)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_node_properties_are_read_by_id_or_hostname(self):
+        self.assertEqual(make_lookup(node_property, node_id='node1').run(['env']), ['prod'])
+        self.assertEqual(make_lookup(node_property, hostname='web-2', default='').run(['env']), [''])
+        self.assertEqual(FakeClient.requests, ['/api/latest/nodes?include=minimal,properties'])
+
+    def test_missing_property_or_node_fails(self):
+        with self.assertRaisesRegex(AnsibleLookupError, 'Property env is not defined'):
+            make_lookup(node_property, hostname='web-2').run(['env'])
+        with self.assertRaisesRegex(AnsibleLookupError, 'Node web-3 not found'):
+            make_lookup(node_property, hostname='web-3').run(['env'])
+
+    def test_workers_share_the_disk_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        for hostname in ['web-1', 'web-2']:
+            ApiCache._memory.clear()
+            make_lookup(node_property, hostname=hostname, default='', cache_ttl=300, cache_dir=cache_dir).run(['env'])
+            make_lookup(setting, cache_ttl=300, cache_dir=cache_dir).run(['modified_file_ttl'])
+
+        self.assertEqual(FakeClient.requests, ['/api/latest/nodes?include=minimal,properties', '/api/latest/settings'])
+
+    def test_settings_missing_from_the_list_are_read_one_by_one(self):
+        lookup = make_lookup(setting)
+
+        self.assertEqual(
+            lookup.run(['modified_file_ttl', 'allowed_networks/root']),
+            [30, ['192.168.0.0/16']],
+        )
+        self.assertEqual(FakeClient.requests, ['/api/latest/settings', '/api/latest/settings/allowed_networks/root'])
+
+
+
+class TestLookupsErrors(unittest.TestCase):
+    def setUp(self):
+        ApiCache._memory.clear()
+        self.addCleanup(ApiCache._memory.clear)
+
+    def test_api_errors_are_lookup_errors(self):
+        with mock.patch.object(rudder_client, 'open_url', side_effect=IOError('connection refused')):
+            with self.assertRaisesRegex(AnsibleLookupError, 'Rudder API call failed! connection refused'):
+                make_lookup(setting, rudder_token='token').run(['modified_file_ttl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+from __future__ import absolute_import, division, print_function
+import unittest
+from plugins.modules import compliance
+
+__metaclass__ = type
+
+
+def node(node_id, value, rules, policy_mode):
+    return {
+        'id': node_id,
+        'policyMode': policy_mode,
+        'name': node_id + '.example.com',
+        'compliance': value,
+        'complianceDetails': {'successAlreadyOK': value, 'error': 100 - value},
+        'rules': [{'id': rule, 'name': rule.upper(), 'compliance': value} for rule in rules],
+    }
+
+
+class TestComplianceAggregation(unittest.TestCase):
+    def test_aggregation(self):
+        self.maxDiff = None
+        aggregator = compliance.ComplianceAggregator(threshold=90)
+        aggregator.add(node('node1', 100, ['r1', 'r2'], 'enforce'))
+        aggregator.add(node('node2', 80, ['r1'], 'audit'))
+        aggregator.add(node('node3', 60, ['r2'], 'enforce'))
+
+        self.assertEqual(
+            aggregator.result(),
+            {
+                'compliance': 80.0,
+                'nodes_count': 3,
+                'by_rule': {
+                    'r1': {'name': 'R1', 'nodes': 2, 'compliance': 90.0},
+                    'r2': {'name': 'R2', 'nodes': 2, 'compliance': 80.0},
+                },
+                'by_policy_mode': {
+                    'enforce': {'nodes': 2, 'compliance': 80.0},
+                    'audit': {'nodes': 1, 'compliance': 80.0},
+                },
+                'by_state': {'successAlreadyOK': 80.0, 'error': 20.0},
+                'non_compliant_nodes': [
+                    {'id': 'node3', 'name': 'node3.example.com', 'compliance': 60.0},
+                    {'id': 'node2', 'name': 'node2.example.com', 'compliance': 80.0},
+                ],
+            },
+        )
+
+    def test_empty_aggregation(self):
+        result = compliance.ComplianceAggregator(threshold=100).result()
+        self.assertEqual(result['compliance'], 0.0)
+        self.assertEqual(result['nodes_count'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
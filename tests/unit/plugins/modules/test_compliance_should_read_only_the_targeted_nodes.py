@@ -0,0 +1,50 @@
+from __future__ import absolute_import, division, print_function
+import unittest
+from plugins.modules import compliance
+from parameterized import parameterized
+
+__metaclass__ = type
+
+
+class FakeModule(object):
+    def __init__(self, **params):
+        self.params = dict(rudder_url='https://rudder.example.com/rudder', rudder_token='token', validate_certs=True,
+                           node_ids=None, group_id=None, query=None)
+        self.params.update(params)
+
+
+class FakeComplianceInterface(compliance.RudderComplianceInterface):
+    def __init__(self, module):
+        super(FakeComplianceInterface, self).__init__(module, raise_errors=True)
+        self.requests = []
+
+    def _send_request(self, path, data=None, headers=None, method='GET'):
+        self.requests.append(path)
+        if path.startswith('/api/latest/groups/'):
+            return {'data': {'groups': [{'id': 'web', 'nodeIds': ['node2', 'node3']}]}}
+        return {'data': {'nodes': [{'id': 'node1'}, {'id': 'node2'}]}}
+
+
+class TestComplianceTargets(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ['node ids', {'node_ids': ['node1', 'node4']}, ['node1', 'node4'], []],
+            ['group', {'group_id': 'web'}, ['node2', 'node3'], ['/api/latest/groups/web']],
+            ['all nodes', {}, ['node1', 'node2'], ['/api/latest/nodes?include=minimal']],
+            [
+                'query',
+                {'query': {'where': [{'object_type': 'node', 'attribute': 'OS', 'comparator': 'eq', 'value': 'Linux'}]}},
+                ['node1', 'node2'],
+                ['/api/latest/nodes?include=minimal&where=[{"objectType":"node","attribute":"OS","comparator":"eq","value":"Linux"}]'],
+            ],
+        ]
+    )
+    def test_targets(self, _name, params, expected_nodes, expected_requests):
+        rudder_compliance_iface = FakeComplianceInterface(FakeModule(**params))
+
+        self.assertEqual(rudder_compliance_iface.get_target_nodes(), expected_nodes)
+        self.assertEqual(rudder_compliance_iface.requests, expected_requests)
+
+
+if __name__ == '__main__':
+    unittest.main()
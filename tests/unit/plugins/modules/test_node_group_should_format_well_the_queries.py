@@ -0,0 +1,54 @@
+from __future__ import absolute_import, division, print_function
+import unittest
+from plugins.modules import node_group
+
+__metaclass__ = type
+
+
+class TestGroupQueries(unittest.TestCase):
+    def test_query_translation(self):
+        self.maxDiff = None
+        self.assertEqual(
+            node_group.json_query_to_api_query({
+                'select': 'nodeAndPolicyServer',
+                'composition': 'or',
+                'where': [
+                    {
+                        'object_type': 'node',
+                        'attribute': 'nodeHostname',
+                        'comparator': 'regex',
+                        'value': 'web-.*',
+                    },
+                ],
+            }),
+            {
+                'select': 'nodeAndPolicyServer',
+                'composition': 'Or',
+                'where': [
+                    {
+                        'objectType': 'node',
+                        'attribute': 'nodeHostname',
+                        'comparator': 'regex',
+                        'value': 'web-.*',
+                    },
+                ],
+            },
+        )
+
+    def test_api_queries_comparison_ignores_case_and_extra_fields(self):
+        expected = {
+            'select': 'node',
+            'composition': 'And',
+            'where': [{'objectType': 'node', 'attribute': 'OS', 'comparator': 'eq', 'value': 'Linux'}],
+        }
+        from_api = {
+            'select': 'node',
+            'composition': 'and',
+            'transform': 'identity',
+            'where': [{'objectType': 'node', 'attribute': 'OS', 'comparator': 'eq', 'value': 'Linux'}],
+        }
+        self.assertEqual(node_group.normalize_api_query(expected), node_group.normalize_api_query(from_api))
+
+
+if __name__ == '__main__':
+    unittest.main()
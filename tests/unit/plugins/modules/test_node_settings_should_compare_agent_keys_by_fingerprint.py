@@ -0,0 +1,47 @@
+from __future__ import absolute_import, division, print_function
+import os
+import shutil
+import tempfile
+import unittest
+from plugins.modules import node_settings
+from parameterized import parameterized
+
+__metaclass__ = type
+
+CERTIFICATE = '-----BEGIN CERTIFICATE-----\na2V5LW9uZQ==\n-----END CERTIFICATE-----\n'
+
+
+class TestAgentKeysFingerprint(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ['same value', CERTIFICATE, True],
+            ['other line wrapping', '-----BEGIN CERTIFICATE-----\r\na2V5LW9u\r\n  ZQ==\r\n-----END CERTIFICATE-----', True],
+            ['other headers', '-----BEGIN PUBLIC KEY-----\na2V5LW9uZQ==\n-----END PUBLIC KEY-----', True],
+            ['other key', '-----BEGIN CERTIFICATE-----\na2V5LXR3bw==\n-----END CERTIFICATE-----\n', False],
+        ]
+    )
+    def test_fingerprint_comparison(self, _name, pem, expected):
+        self.assertEqual(
+            node_settings.pem_fingerprint(pem) == node_settings.pem_fingerprint(CERTIFICATE),
+            expected,
+        )
+
+    @parameterized.expand([[None], [''], ['-----BEGIN CERTIFICATE-----\nnot base64!\n-----END CERTIFICATE-----']])
+    def test_invalid_values_have_no_fingerprint(self, pem):
+        self.assertIsNone(node_settings.pem_fingerprint(pem))
+
+    def test_keys_mapping_overrides_keys_directory(self):
+        keys_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, keys_dir)
+        for file_name in ['node1.pem', 'node2.pem', 'README']:
+            with open(os.path.join(keys_dir, file_name), 'w') as key_file:
+                key_file.write(file_name)
+
+        self.assertEqual(
+            node_settings.load_agent_keys({'node2': 'mapping', 'node3': 'mapping'}, keys_dir),
+            {'node1': 'node1.pem', 'node2': 'mapping', 'node3': 'mapping'},
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+from __future__ import absolute_import, division, print_function
+import unittest
+from unittest import mock
+from plugins.modules import node_settings
+
+__metaclass__ = type
+
+DOWN_URL = 'https://down.example.com/rudder'
+
+
+class ModuleFailure(Exception):
+    pass
+
+
+class FakeModule(object):
+    def __init__(self, servers, **params):
+        self.params = dict(node_id=None, group_id=None, policy_server_id=None, query=None, agent_keys=None,
+                           agent_keys_dir=None, max_workers=4, servers=servers)
+        self.params.update(params)
+
+    def fail_json(self, **kwargs):
+        raise ModuleFailure(kwargs['msg'])
+
+
+class FakeNodeSettingsInterface(object):
+    def __init__(self, module, server=None):
+        if server['rudder_url'] == DOWN_URL:
+            raise node_settings.RudderApiError('Rudder API call failed!')
+        self.modified_settings = []
+
+    def evaluate_node_query(self, query=None):
+        return ('?where=', ['query-node'])
+
+    def get_group_nodes(self, group_id):
+        return ['{group_id}-node'.format(group_id=group_id)]
+
+    def set_node_settings(self, node_id):
+        self.modified_settings.append({node_id: {'policyMode': 'enforce'}})
+        return node_id != 'root'
+
+
+class TestNodeSettingsServers(unittest.TestCase):
+    def converge(self, servers, **params):
+        with mock.patch.object(node_settings, 'RudderNodeSettingsInterface', FakeNodeSettingsInterface):
+            return node_settings.converge_servers(FakeModule(servers, **params))
+
+    def test_each_server_is_converged_with_its_own_targets(self):
+        results = self.converge(
+            [
+                {'rudder_url': 'https://eu.example.com/rudder'},
+                {'rudder_url': 'https://us.example.com/rudder', 'node_id': 'root'},
+            ],
+            group_id='web',
+        )
+
+        self.assertEqual(results['https://eu.example.com/rudder']['nodes'], {'web-node': True})
+        self.assertTrue(results['https://eu.example.com/rudder']['changed'])
+        self.assertEqual(results['https://us.example.com/rudder']['nodes'], {'root': False})
+        self.assertFalse(results['https://us.example.com/rudder']['changed'])
+        self.assertEqual(
+            results['https://us.example.com/rudder']['modified_settings'],
+            [{'root': {'policyMode': 'enforce'}}],
+        )
+
+    def test_failing_server_does_not_abort_the_others(self):
+        results = self.converge(
+            [{'rudder_url': DOWN_URL}, {'rudder_url': 'https://eu.example.com/rudder'}],
+            node_id='node1',
+        )
+
+        self.assertTrue(results[DOWN_URL]['failed'])
+        self.assertEqual(results[DOWN_URL]['errors'], ['Rudder API call failed!'])
+        self.assertFalse(results['https://eu.example.com/rudder']['failed'])
+        self.assertEqual(results['https://eu.example.com/rudder']['nodes'], {'node1': True})
+
+    def test_servers_are_listed_once(self):
+        with self.assertRaisesRegex(ModuleFailure, 'duplicates: https://eu.example.com/rudder'):
+            self.converge(
+                [{'rudder_url': 'https://eu.example.com/rudder'}, {'rudder_url': 'https://eu.example.com/rudder'}],
+                node_id='node1',
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+from __future__ import absolute_import, division, print_function
+import unittest
+from plugins.modules import node_settings
+from parameterized import parameterized
+
+__metaclass__ = type
+
+
+class FakeModule(object):
+    def __init__(self, **params):
+        self.params = dict(rudder_url='https://rudder.example.com/rudder', rudder_token='token', validate_certs=True)
+        self.params.update(params)
+
+
+class FakeNodeSettingsInterface(node_settings.RudderNodeSettingsInterface):
+    def __init__(self, module):
+        super(FakeNodeSettingsInterface, self).__init__(module)
+        self.posted = []
+
+    def _send_request(self, path, data=None, headers=None, method='GET'):
+        if method == 'POST':
+            self.posted.append(path)
+            return {}
+        return {'data': {'nodes': [{
+            'id': 'node1',
+            'policyMode': 'audit',
+            'state': 'enabled',
+            'properties': [{'name': 'env', 'value': 'prod'}],
+        }]}}
+
+
+class TestNodeSettingsUpdate(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ['same policy mode', {'policy_mode': 'audit'}, False],
+            ['same policy mode and state', {'policy_mode': 'audit', 'state': 'enabled'}, False],
+            ['same property', {'properties': [{'name': 'env', 'value': 'prod'}]}, False],
+            ['other policy mode', {'policy_mode': 'enforce'}, True],
+            ['other property', {'properties': [{'name': 'env', 'value': 'dev'}]}, True],
+            ['new property', {'policy_mode': 'audit', 'properties': [{'name': 'team', 'value': 'web'}]}, True],
+        ]
+    )
+    def test_node_is_posted_only_when_a_setting_differs(self, _name, params, expected):
+        rudder_node_iface = FakeNodeSettingsInterface(FakeModule(**params))
+
+        self.assertEqual(rudder_node_iface.set_node_settings('node1'), expected)
+        self.assertEqual(rudder_node_iface.posted, ['/api/latest/nodes/node1'] if expected else [])
+        self.assertEqual(bool(rudder_node_iface.modified_settings), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
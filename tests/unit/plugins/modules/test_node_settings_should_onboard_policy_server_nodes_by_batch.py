@@ -0,0 +1,72 @@
+from __future__ import absolute_import, division, print_function
+import threading
+import unittest
+from plugins.modules import node_settings
+from parameterized import parameterized
+
+__metaclass__ = type
+
+
+class FakeModule(object):
+    def __init__(self, batch_size):
+        self.params = {'batch_size': batch_size, 'max_workers': 4}
+
+
+class FakeNodeSettingsInterface(object):
+    def __init__(self, settings_to_set, failing_batch=None):
+        self.settings_to_set = settings_to_set
+        self.failing_batch = failing_batch
+        self.batches = []
+        self.configured = []
+        self._lock = threading.Lock()
+
+    def get_policy_server_nodes(self, policy_server_id):
+        return (['p1', 'p2', 'p3', 'p4', 'p5'], ['n1'])
+
+    def set_pending_nodes_status(self, node_ids, status):
+        self.batches.append((node_ids, status))
+        if node_ids == self.failing_batch:
+            raise node_settings.RudderApiError('batch failed')
+
+    def set_node_settings(self, node_id):
+        with self._lock:
+            self.configured.append(node_id)
+        return node_id != 'n1'
+
+
+class TestPolicyServerOnboarding(unittest.TestCase):
+    @parameterized.expand(
+        [
+            [2, [['p1', 'p2'], ['p3', 'p4'], ['p5']]],
+            [100, [['p1', 'p2', 'p3', 'p4', 'p5']]],
+        ]
+    )
+    def test_pending_nodes_are_accepted_by_batch(self, batch_size, expected_batches):
+        iface = FakeNodeSettingsInterface({'status': 'accepted', 'policyMode': 'enforce'})
+        result = node_settings.converge_policy_server_nodes(iface, FakeModule(batch_size), 'relay1')
+
+        self.assertEqual(iface.batches, [(batch, 'accepted') for batch in expected_batches])
+        self.assertEqual(sorted(iface.configured), ['n1', 'p1', 'p2', 'p3', 'p4', 'p5'])
+        self.assertTrue(result['changed'])
+        self.assertFalse(result['nodes']['n1'])
+        self.assertEqual(result['errors'], [])
+
+    def test_failed_batch_is_reported_and_not_configured(self):
+        iface = FakeNodeSettingsInterface({'status': 'accepted', 'policyMode': 'enforce'}, failing_batch=['p3', 'p4'])
+        result = node_settings.converge_policy_server_nodes(iface, FakeModule(2), 'relay1')
+
+        self.assertEqual(sorted(iface.configured), ['n1', 'p1', 'p2', 'p5'])
+        self.assertEqual(result['errors'], ['batch failed'])
+        self.assertFalse(result['nodes']['p3'])
+
+    def test_refused_nodes_are_not_configured(self):
+        iface = FakeNodeSettingsInterface({'status': 'refused'})
+        result = node_settings.converge_policy_server_nodes(iface, FakeModule(100), 'relay1')
+
+        self.assertEqual(iface.configured, [])
+        self.assertTrue(result['nodes']['p1'])
+        self.assertFalse(result['nodes']['n1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
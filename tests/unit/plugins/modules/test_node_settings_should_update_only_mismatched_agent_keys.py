@@ -0,0 +1,145 @@
+from __future__ import absolute_import, division, print_function
+import threading
+import time
+import unittest
+from unittest import mock
+from plugins.modules import node_settings
+from parameterized import parameterized
+
+__metaclass__ = type
+
+CERTIFICATE = '-----BEGIN CERTIFICATE-----\na2V5LW9uZQ==\n-----END CERTIFICATE-----\n'
+REWRAPPED_CERTIFICATE = '-----BEGIN CERTIFICATE-----\na2V5LW9u\nZQ==\n-----END CERTIFICATE-----'
+OTHER_CERTIFICATE = '-----BEGIN CERTIFICATE-----\na2V5LXR3bw==\n-----END CERTIFICATE-----\n'
+
+
+class FakeModule(object):
+    def __init__(self, agent_keys, rate_limit=0, max_workers=4):
+        self.params = {
+            'agent_keys': agent_keys,
+            'agent_keys_dir': None,
+            'agent_keys_status': 'certified',
+            'rate_limit': rate_limit,
+            'max_workers': max_workers,
+        }
+
+
+class FakeNodeSettingsInterface(object):
+    def __init__(self, current_keys, failing_node=None):
+        self.current_keys = current_keys
+        self.failing_node = failing_node
+        self.updates = []
+        self.update_times = []
+        self._lock = threading.Lock()
+
+    def get_agent_keys(self):
+        return self.current_keys
+
+    def set_agent_key(self, node_id, value, status):
+        with self._lock:
+            self.updates.append((node_id, value, status))
+            self.update_times.append(time.monotonic())
+        if node_id == self.failing_node:
+            raise node_settings.RudderApiError('update failed')
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+class TestAgentKeysConvergence(unittest.TestCase):
+    def test_matching_keys_are_not_posted(self):
+        iface = FakeNodeSettingsInterface({
+            'n1': {'status': 'certified', 'value': REWRAPPED_CERTIFICATE},
+            'n2': {'status': 'certified', 'value': OTHER_CERTIFICATE},
+        })
+        result = node_settings.converge_agent_keys(
+            iface, FakeModule({'n1': CERTIFICATE, 'n2': CERTIFICATE})
+        )
+
+        self.assertEqual(iface.updates, [('n2', CERTIFICATE, 'certified')])
+        self.assertEqual(result['nodes'], {'n1': False, 'n2': True})
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['errors'], [])
+
+    def test_status_mismatch_alone_triggers_an_update(self):
+        iface = FakeNodeSettingsInterface({'n1': {'status': 'undefined', 'value': CERTIFICATE}})
+        result = node_settings.converge_agent_keys(iface, FakeModule({'n1': CERTIFICATE}))
+
+        self.assertEqual(iface.updates, [('n1', CERTIFICATE, 'certified')])
+        self.assertTrue(result['changed'])
+
+    @parameterized.expand(
+        [
+            ['unknown node', 'n9', CERTIFICATE, 'Node n9 not found'],
+            ['invalid value', 'n1', 'not a key', 'Invalid PEM value for node n1'],
+        ]
+    )
+    def test_errors_are_reported_without_update(self, _name, node_id, value, expected_error):
+        iface = FakeNodeSettingsInterface({'n1': {'status': 'certified', 'value': OTHER_CERTIFICATE}})
+        result = node_settings.converge_agent_keys(iface, FakeModule({node_id: value}))
+
+        self.assertEqual(iface.updates, [])
+        self.assertEqual(result['errors'], [expected_error])
+        self.assertFalse(result['changed'])
+
+    def test_failed_update_is_reported(self):
+        iface = FakeNodeSettingsInterface(
+            {
+                'n1': {'status': 'certified', 'value': OTHER_CERTIFICATE},
+                'n2': {'status': 'certified', 'value': OTHER_CERTIFICATE},
+            },
+            failing_node='n1',
+        )
+        result = node_settings.converge_agent_keys(
+            iface, FakeModule({'n1': CERTIFICATE, 'n2': CERTIFICATE})
+        )
+
+        self.assertEqual(result['nodes'], {'n1': False, 'n2': True})
+        self.assertEqual(result['errors'], ['n1: update failed'])
+
+    def test_rate_limit_spaces_out_the_updates(self):
+        agent_keys = {'n{i}'.format(i=i): CERTIFICATE for i in range(5)}
+        iface = FakeNodeSettingsInterface(
+            {node_id: {'status': 'undefined', 'value': CERTIFICATE} for node_id in agent_keys}
+        )
+        node_settings.converge_agent_keys(iface, FakeModule(agent_keys, rate_limit=20, max_workers=5))
+
+        update_times = sorted(iface.update_times)
+        self.assertEqual(len(update_times), 5)
+        # 20 requests per second, so at least 50ms between two updates
+        for previous, current in zip(update_times, update_times[1:]):
+            self.assertGreaterEqual(current - previous, 0.045)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_calls_are_spaced_by_the_rate_interval(self):
+        clock = FakeClock()
+        with mock.patch.object(node_settings, 'time', clock):
+            rate_limiter = node_settings.RateLimiter(4)
+            for _ in range(3):
+                rate_limiter.wait()
+
+        self.assertEqual(clock.sleeps, [0.25, 0.25])
+
+    def test_no_rate_does_not_wait(self):
+        clock = FakeClock()
+        with mock.patch.object(node_settings, 'time', clock):
+            rate_limiter = node_settings.RateLimiter(0)
+            for _ in range(3):
+                rate_limiter.wait()
+
+        self.assertEqual(clock.sleeps, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
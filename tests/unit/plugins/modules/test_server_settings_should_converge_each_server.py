@@ -0,0 +1,93 @@
+from __future__ import absolute_import, division, print_function
+import json
+import unittest
+from unittest import mock
+from plugins.modules import server_settings
+
+__metaclass__ = type
+
+DOWN_URL = 'https://down.example.com/rudder'
+
+
+class ModuleFailure(Exception):
+    pass
+
+
+class FakeModule(object):
+    def __init__(self, servers):
+        self.params = dict(max_workers=4, servers=servers)
+
+    def fail_json(self, **kwargs):
+        raise ModuleFailure(kwargs['msg'])
+
+    def from_json(self, value):
+        return json.loads(value)
+
+
+class FakeSettingsInterface(object):
+    def __init__(self, module, server=None):
+        self.url = server['rudder_url']
+        self.settings = {'modified_file_ttl': 30}
+        self.variables = {'raw_value': [], 'requests': []}
+
+    def get_SettingValue(self, name):
+        if self.url == DOWN_URL:
+            raise server_settings.RudderApiError('Rudder API call failed')
+        return self.settings[name]
+
+    def set_SettingValue(self, name, value):
+        self.settings[name] = value
+
+    def compare_settings_value(self, left, right):
+        return left == right
+
+    def log_variable(self, name, value):
+        self.variables[name] = value
+
+
+class TestServerSettingsServers(unittest.TestCase):
+    def converge(self, servers, value):
+        with mock.patch.object(server_settings, 'RudderSettingsInterface', FakeSettingsInterface):
+            return server_settings.converge_servers(FakeModule(servers), 'modified_file_ttl', value)
+
+    def test_each_server_is_converged_with_its_own_value(self):
+        results = self.converge(
+            [
+                {'rudder_url': 'https://eu.example.com/rudder', 'value': None},
+                {'rudder_url': 'https://us.example.com/rudder', 'value': '45'},
+            ],
+            30,
+        )
+
+        self.assertFalse(results['https://eu.example.com/rudder']['changed'])
+        self.assertEqual(results['https://eu.example.com/rudder']['message'], 'Already correct')
+        self.assertTrue(results['https://us.example.com/rudder']['changed'])
+        self.assertEqual(results['https://us.example.com/rudder']['variables']['new_value'], 45)
+
+    def test_failing_server_does_not_abort_the_others(self):
+        results = self.converge(
+            [
+                {'rudder_url': DOWN_URL, 'value': None},
+                {'rudder_url': 'https://eu.example.com/rudder', 'value': None},
+            ],
+            60,
+        )
+
+        self.assertTrue(results[DOWN_URL]['failed'])
+        self.assertEqual(results[DOWN_URL]['message'], 'Rudder API call failed')
+        self.assertFalse(results['https://eu.example.com/rudder']['failed'])
+        self.assertTrue(results['https://eu.example.com/rudder']['changed'])
+
+    def test_servers_are_listed_once(self):
+        with self.assertRaisesRegex(ModuleFailure, 'duplicates: https://eu.example.com/rudder'):
+            self.converge(
+                [
+                    {'rudder_url': 'https://eu.example.com/rudder', 'value': None},
+                    {'rudder_url': 'https://eu.example.com/rudder', 'value': '45'},
+                ],
+                30,
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+from __future__ import absolute_import, division, print_function
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from plugins.plugin_utils.rudder_api import ApiCache, ApiCacheError
+
+__metaclass__ = type
+
+
+class Fetch(object):
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+class TestApiCache(unittest.TestCase):
+    def setUp(self):
+        ApiCache._memory.clear()
+        self.addCleanup(ApiCache._memory.clear)
+        self.cache_dir = os.path.join(tempfile.mkdtemp(), 'cache')
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.cache_dir))
+
+    def forget_memory(self):
+        # What a new forked worker sees
+        ApiCache._memory.clear()
+
+    def test_memory_only_by_default(self):
+        fetch = Fetch({'env': 'prod'})
+        cache = ApiCache(cache_dir=self.cache_dir)
+
+        self.assertEqual(cache.get('key', fetch), {'env': 'prod'})
+        self.assertEqual(cache.get('key', fetch), {'env': 'prod'})
+        self.forget_memory()
+        cache.get('key', fetch)
+
+        self.assertEqual(fetch.calls, 2)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_disk_cache_is_shared_between_workers(self):
+        fetch = Fetch({'env': 'prod'})
+
+        ApiCache(300, self.cache_dir).get('key', fetch)
+        self.forget_memory()
+        self.assertEqual(ApiCache(300, self.cache_dir).get('key', fetch), {'env': 'prod'})
+
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(os.stat(self.cache_dir).st_mode & 0o777, 0o700)
+
+    def test_expired_disk_entries_are_fetched_again(self):
+        fetch = Fetch({'env': 'prod'})
+
+        with mock.patch('time.time', return_value=1000):
+            ApiCache(300, self.cache_dir).get('key', fetch)
+        self.forget_memory()
+        with mock.patch('time.time', return_value=1301):
+            ApiCache(300, self.cache_dir).get('key', fetch)
+
+        self.assertEqual(fetch.calls, 2)
+
+    def test_default_directory_belongs_to_the_user(self):
+        self.assertTrue(ApiCache().cache_dir.startswith(os.path.expanduser('~') + os.sep))
+
+    def test_directory_writable_by_others_is_refused(self):
+        os.makedirs(self.cache_dir)
+        os.chmod(self.cache_dir, 0o777)
+        fetch = Fetch({})
+
+        with self.assertRaisesRegex(ApiCacheError, 'writable by other users'):
+            ApiCache(300, self.cache_dir).get('key', fetch)
+        self.assertEqual(fetch.calls, 0)
+
+    def test_directory_of_another_user_is_refused(self):
+        os.makedirs(self.cache_dir, 0o700)
+
+        with mock.patch('os.geteuid', return_value=os.stat(self.cache_dir).st_uid + 1):
+            with self.assertRaisesRegex(ApiCacheError, 'not owned by the current user'):
+                ApiCache(300, self.cache_dir).get('key', Fetch({}))
+
+
+if __name__ == '__main__':
+    unittest.main()
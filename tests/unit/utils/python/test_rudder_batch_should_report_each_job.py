@@ -0,0 +1,88 @@
+from __future__ import absolute_import, division, print_function
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from utils.python import rudder_batch
+
+__metaclass__ = type
+
+
+class TestRudderBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as params_file:
+            params_file.write(content)
+        return path
+
+    def test_load_jobs_accepts_one_mapping_or_a_list(self):
+        self.assertEqual(
+            rudder_batch.load_jobs(self.write('one.json', '{"node_id": "root"}')),
+            [{'node_id': 'root'}],
+        )
+        self.assertEqual(
+            rudder_batch.load_jobs(self.write('many.yml', '- node_id: root\n- group_id: web\n')),
+            [{'node_id': 'root'}, {'group_id': 'web'}],
+        )
+        with self.assertRaisesRegex(ValueError, 'expected a mapping of parameters'):
+            rudder_batch.load_jobs(self.write('bad.yml', '- root\n'))
+
+    def test_invalid_parameters_are_reported(self):
+        result = rudder_batch.run_job('server_settings', {'value': 30})
+
+        self.assertTrue(result['failed'])
+        self.assertIn('name', result['msg'])
+
+    def test_module_constraints_are_applied(self):
+        result = rudder_batch.run_job('node_settings', {
+            'rudder_token': 'token',
+            'agent_keys': {'node1': 'key'},
+            'agent_key': {'status': 'certified'},
+        })
+
+        self.assertTrue(result['failed'])
+        self.assertIn('mutually exclusive', result['msg'])
+
+    def test_unexpected_errors_are_reported_per_job(self):
+        result = rudder_batch.run_job('node_settings', {
+            'rudder_token': 'token',
+            'agent_keys_dir': os.path.join(self.tmp_dir, 'missing'),
+        })
+
+        self.assertTrue(result['failed'])
+        self.assertFalse(result['changed'])
+        self.assertIn('missing', result['msg'])
+
+    def test_every_job_runs_and_exit_code_reports_failures(self):
+        run = mock.Mock(side_effect=[{'failed': False, 'changed': True}, OSError('boom'), {'failed': False, 'changed': False}])
+        path = self.write('jobs.yml', '- {name: a, value: 1}\n- {name: b, value: 2}\n- {name: c, value: 3}\n')
+        stdout = io.StringIO()
+
+        with mock.patch.dict(rudder_batch.COMMANDS, {'server_settings': (rudder_batch.server_settings, run)}):
+            with mock.patch('sys.stdout', stdout):
+                exit_code = rudder_batch.main(['server_settings', path])
+
+        results = json.loads(stdout.getvalue())
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(run.call_count, 3)
+        self.assertEqual([result['failed'] for result in results], [False, True, False])
+        self.assertEqual(results[1]['msg'], 'OSError: boom')
+
+    def test_exit_code_is_zero_when_every_job_succeeds(self):
+        run = mock.Mock(return_value={'failed': False, 'changed': False})
+        path = self.write('jobs.json', '{"name": "a", "value": 1}')
+
+        with mock.patch.dict(rudder_batch.COMMANDS, {'server_settings': (rudder_batch.server_settings, run)}):
+            with mock.patch('sys.stdout', io.StringIO()):
+                self.assertEqual(rudder_batch.main(['server_settings', path]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2025, Rudder <dev@rudder.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Run node_settings and server_settings jobs without ansible-playbook
+
+Each parameters file (YAML or JSON) holds the parameters of one module call,
+or a list of them, exactly as they would be written in a task. They are
+validated against the module argument spec and applied with the same code
+as the modules. Results are printed as JSON, one entry per job, and the
+exit code is 1 if any job failed.
+
+Only the ansible-core library is needed, no inventory nor configuration.
+
+Examples:
+    rudder_batch.py node_settings nodes.yml
+    rudder_batch.py server_settings settings.json
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import json
+import os
+import sys
+
+# Make the collection importable the same way as in the unit tests
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator  # noqa: E402
+
+from plugins.modules import node_settings, server_settings  # noqa: E402
+from plugins.plugin_utils.rudder_api import ModuleShim, RudderModuleError  # noqa: E402
+
+__metaclass__ = type
+
+
+def run_node_settings(module):
+    if module.params.get('servers'):
+        servers = node_settings.converge_servers(module)
+        return {
+            'failed': any(s['failed'] for s in servers.values()),
+            'changed': any(s['changed'] for s in servers.values()),
+            'servers': servers,
+        }
+
+    rudder_node_iface = node_settings.RudderNodeSettingsInterface(module)
+    result = node_settings.converge_targets(
+        rudder_node_iface,
+        module,
+        module.params.get('node_id', None),
+        module.params.get('query', None),
+        module.params.get('group_id', None),
+        module.params.get('policy_server_id', None),
+    )
+    return {
+        'failed': bool(result['errors']),
+        'changed': result['changed'],
+        'expected_settings': rudder_node_iface.settings_to_set,
+        'modified_settings': rudder_node_iface.modified_settings,
+        'nodes': result['nodes'],
+        'query': result['query'],
+        'errors': [str(err) for err in result['errors']],
+    }
+
+
+def run_server_settings(module):
+    name = module.params['name']
+    value = server_settings.parse_value(module, module.params['value'])
+
+    if module.params.get('servers'):
+        servers = server_settings.converge_servers(module, name, value)
+        return {
+            'failed': any(s['failed'] for s in servers.values()),
+            'changed': any(s['changed'] for s in servers.values()),
+            'servers': servers,
+        }
+
+    rudder_server_iface = server_settings.RudderSettingsInterface(module)
+    (changed, msg) = server_settings.converge_setting(rudder_server_iface, name, value)
+    return {
+        'failed': False,
+        'changed': changed,
+        'message': msg,
+        'variables': rudder_server_iface.variables,
+    }
+
+
+COMMANDS = {
+    'node_settings': (node_settings, run_node_settings),
+    'server_settings': (server_settings, run_server_settings),
+}
+
+
+def load_jobs(path):
+    with open(path) as params_file:
+        if path.endswith('.json'):
+            jobs = json.load(params_file)
+        else:
+            # Only pay for the YAML parser when it is needed
+            import yaml
+            jobs = yaml.safe_load(params_file)
+    if isinstance(jobs, dict):
+        jobs = [jobs]
+    if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+        raise ValueError('{path}: expected a mapping of parameters or a list of them'.format(path=path))
+    return jobs
+
+
+def run_job(command, params):
+    """Validate and run one job, any failure is returned as a failed result"""
+    (module, run) = COMMANDS[command]
+    validator = ArgumentSpecValidator(module.argument_spec(), **module.argument_constraints())
+    validation = validator.validate(params)
+    if validation.error_messages:
+        return {'failed': True, 'changed': False, 'msg': ', '.join(validation.error_messages)}
+    try:
+        return run(ModuleShim(validation.validated_parameters))
+    except RudderModuleError as e:
+        result = dict(e.result)
+        result.update({'failed': True, 'changed': False})
+        return result
+    except Exception as e:
+        # Keep going with the next jobs, whose results would be lost otherwise
+        return {
+            'failed': True,
+            'changed': False,
+            'msg': '{error}: {message}'.format(error=type(e).__name__, message=e),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run Rudder node_settings or server_settings jobs from parameter files.')
+    parser.add_argument('command', choices=sorted(COMMANDS))
+    parser.add_argument('params_files', nargs='+', metavar='PARAMS_FILE', help='YAML or JSON file of module parameters')
+    args = parser.parse_args(argv)
+
+    results = []
+    for path in args.params_files:
+        try:
+            jobs = load_jobs(path)
+        except (IOError, OSError, ValueError) as e:
+            parser.error(str(e))
+        for params in jobs:
+            results.append(run_job(args.command, params))
+
+    json.dump(results, sys.stdout, indent=2, sort_keys=True, default=str)
+    sys.stdout.write('\n')
+    return 1 if any(result['failed'] for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())